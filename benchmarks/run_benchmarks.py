@@ -0,0 +1,265 @@
+'''
+Performance benchmarks for decoding, seeking, resizing, frame creation and audio loading.
+Test media is generated locally with FFmpeg, so no resources folder is needed.
+
+Usage: python benchmarks/run_benchmarks.py [--output results.json] [--only readers seek ...]
+'''
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pyvidplayer2  # noqa: E402
+from pyvidplayer2 import get_ffmpeg_path, get_version_info  # noqa: E402
+
+MEDIA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "media")
+
+# name -> (width, height, frame rate, seconds)
+MEDIA = {
+    "480p": (854, 480, 30, 10),
+    "1080p": (1920, 1080, 30, 10),
+}
+
+SEEKS = 20
+RESIZE_FRAMES = 60
+CREATE_FRAMES = 60
+AUDIO_CHUNKS = 5
+
+
+def generate_media(name):
+    w, h, fps, seconds = MEDIA[name]
+    path = os.path.join(MEDIA_DIR, f"{name}.mp4")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(MEDIA_DIR, exist_ok=True)
+    subprocess.run([
+        get_ffmpeg_path(),
+        "-loglevel", "error",
+        "-y",
+        "-f", "lavfi", "-i", f"testsrc=size={w}x{h}:rate={fps}:duration={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=44100:duration={seconds}",
+        "-ac", "2",
+        "-c:v", "libx264",
+        "-pix_fmt", "yuv420p",
+        "-g", str(fps),  # one keyframe per second
+        "-c:a", "aac",
+        path
+    ], check=True)
+
+    return path
+
+
+def get_readers():
+    readers = {"ffmpeg": lambda path: pyvidplayer2.video.FFMPEGReader(path)}
+    if importlib.util.find_spec("cv2") is not None:
+        readers["opencv"] = lambda path: pyvidplayer2.video.CVReader(path)
+    if importlib.util.find_spec("decord") is not None:
+        readers["decord"] = lambda path: pyvidplayer2.video.DecordReader(path)
+    if importlib.util.find_spec("imageio") is not None and importlib.util.find_spec("av") is not None:
+        readers["imageio"] = lambda path: pyvidplayer2.video.IIOReader(path)
+    return readers
+
+
+def summarize(times):
+    times = sorted(times)
+    return {
+        "mean_ms": statistics.mean(times) * 1000,
+        "median_ms": statistics.median(times) * 1000,
+        "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+        "samples": len(times)
+    }
+
+
+# frames per second when reading every frame of each file
+def bench_readers(paths):
+    results = {}
+    for media, path in paths.items():
+        for name, create in get_readers().items():
+            reader = create(path)
+            frames = 0
+            t = time.perf_counter()
+            while reader.read()[0]:
+                frames += 1
+            elapsed = time.perf_counter() - t
+            reader.release()
+            results[f"{name}/{media}"] = {"fps": frames / elapsed, "frames": frames}
+
+        # buffer pool and skipped frames are ffmpeg reader options
+        for label, kwargs, func in (("ffmpeg_pooled", {"buffer_pool": 3}, "read"),
+                                    ("ffmpeg_grab", {}, "grab")):
+            reader = pyvidplayer2.video.FFMPEGReader(path, **kwargs)
+            read = getattr(reader, func)
+            frames = 0
+            t = time.perf_counter()
+            while (read()[0] if func == "read" else read()):
+                frames += 1
+            elapsed = time.perf_counter() - t
+            reader.release()
+            results[f"{label}/{media}"] = {"fps": frames / elapsed, "frames": frames}
+    return results
+
+
+# time to seek to a random frame and read it
+def bench_seek(paths):
+    results = {}
+    rng = np.random.default_rng(0)
+    for media, path in paths.items():
+        for name, create in get_readers().items():
+            reader = create(path)
+            indices = rng.integers(0, reader.frame_count - 1, SEEKS)
+            times = []
+            for index in indices:
+                t = time.perf_counter()
+                reader.seek(int(index))
+                reader.read()
+                times.append(time.perf_counter() - t)
+            reader.release()
+            results[f"{name}/{media}"] = summarize(times)
+    return results
+
+
+# frames per second through Video._resize_frame for each resampling path
+def bench_resize(paths):
+    results = {}
+    path = paths["1080p"]
+    reader = pyvidplayer2.video.FFMPEGReader(path)
+    data = reader.read()[1].copy()
+    reader.release()
+
+    with pyvidplayer2.Video(path, no_audio=True, use_pygame_audio=True) as v:
+        for size in ((1280, 720), (640, 360)):
+            paths_ = [("opencv", False)] if pyvidplayer2.video.CV else []
+            paths_.append(("ffmpeg", True))
+            for name, use_ffmpeg in paths_:
+                for interp in (0, 1, 3):
+                    v._resize_frame(data, size, interp, use_ffmpeg)  # warm up, starts the ffmpeg scaler
+                    t = time.perf_counter()
+                    for _ in range(RESIZE_FRAMES):
+                        v._resize_frame(data, size, interp, use_ffmpeg)
+                    elapsed = time.perf_counter() - t
+                    key = f"{name}/{pyvidplayer2.video.FFMPEG_INTERPS[interp]}/{size[0]}x{size[1]}"
+                    results[key] = {"fps": RESIZE_FRAMES / elapsed}
+    return results
+
+
+# cost of converting a decoded frame into each graphics library's image type
+def bench_create_frame(paths):
+    frontends = {
+        "pygame": ("pygame", "VideoPygame", "video_pygame"),
+        "tkinter": ("tkinter", "VideoTkinter", "video_tkinter"),
+        "pyglet": ("pyglet", "VideoPyglet", "video_pyglet"),
+        "pyqt": ("PyQt6", "VideoPyQT", "video_pyqt"),
+        "pyside": ("PySide6", "VideoPySide", "video_pyside"),
+        "raylib": ("pyray", "VideoRaylib", "video_raylib"),
+        "wx": ("wx", "VideoWx", "video_wx"),
+    }
+
+    results = {}
+    for name, (package, cls, module) in frontends.items():
+        if importlib.util.find_spec(package) is None:
+            results[name] = {"skipped": f"{package} is not installed"}
+            continue
+
+        try:
+            video_cls = getattr(importlib.import_module(f"pyvidplayer2.{module}"), cls)
+            with video_cls(paths["1080p"], no_audio=True, use_pygame_audio=True) as v:
+                frames = [v._vid.read()[1].copy() for _ in range(CREATE_FRAMES)]
+                t = time.perf_counter()
+                for data in frames:
+                    v._create_frame(data)
+                elapsed = time.perf_counter() - t
+        except Exception as e:  # most frontends need a window or display to create images
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+        else:
+            results[name] = {"mean_ms": elapsed / CREATE_FRAMES * 1000}
+    return results
+
+
+def wait_for_chunk(video):
+    t = time.perf_counter()
+    while video._chunks_len(video._chunks) < 1:
+        video._update_threads()
+        time.sleep(0.0005)
+    return time.perf_counter() - t
+
+
+# time from seeking until the first audio chunk is ready, the next chunk, and loading a chunk into the audio handler
+def bench_audio(paths):
+    results = {}
+    path = paths["480p"]
+    for label, persistent in (("chunked", False), ("persistent", True)):
+        with pyvidplayer2.Video(path, chunk_size=1, persistent_audio=persistent, use_pygame_audio=True) as v:
+            first, following, load = [], [], []
+            for i in range(AUDIO_CHUNKS):
+                v.seek(i * 1.5, relative=False)
+                first.append(wait_for_chunk(v))
+
+                # same bookkeeping as playing a chunk in Video._update
+                chunk = v._chunks.pop(0)
+                v._chunks_played += 1
+
+                t = time.perf_counter()
+                v._audio.load(chunk, v._get_audio_format()[0])
+                load.append(time.perf_counter() - t)
+
+                following.append(wait_for_chunk(v))
+
+            results[f"{label}/first_chunk"] = summarize(first)
+            results[f"{label}/next_chunk"] = summarize(following)
+            results[f"{label}/handler_load"] = summarize(load)
+    return results
+
+
+BENCHMARKS = {
+    "readers": bench_readers,
+    "seek": bench_seek,
+    "resize": bench_resize,
+    "create_frame": bench_create_frame,
+    "audio": bench_audio,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pyvidplayer2 and output the results as JSON.")
+    parser.add_argument("--output", help="file to write results to, defaults to stdout")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run, defaults to all")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    paths = {name: generate_media(name) for name in MEDIA}
+
+    report = {
+        "versions": get_version_info(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "media": {name: dict(zip(("width", "height", "frame_rate", "seconds"), MEDIA[name])) for name in MEDIA},
+        "results": {}
+    }
+
+    for name in args.only or BENCHMARKS:
+        print(f"running {name}...", file=sys.stderr)
+        report["results"][name] = BENCHMARKS[name](paths)
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
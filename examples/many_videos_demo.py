@@ -13,14 +13,16 @@ win = pygame.display.set_mode((1066, 744))
 pygame.display.set_caption("many videos demo")
 
 # simultaneous playback is only possible when using Sounddevice for audio
-
-videos = [VideoPlayer(Video(r"resources\billiejean.mp4"), (0, 0, 426, 240)),
-          VideoPlayer(Video(r"resources\trailer1.mp4"), (426, 0, 256, 144)),
-          VideoPlayer(Video(r"resources\medic.mov"), (682, 0, 256, 144)),
-          VideoPlayer(Video(r"resources\trailer2.mp4"), (426, 144, 640, 360)),
-          VideoPlayer(Video(r"resources\clip.mp4"), (0, 240, 256, 144)),
-          VideoPlayer(Video(r"resources\birds.avi"), (0, 384, 426, 240)),
-          VideoPlayer(Video(r"resources\ocean.mkv"), (426, 504, 426, 240))]
+# shared_audio mixes every video into one output stream instead of opening one per video
+# persistent_audio keeps one ffmpeg process per video instead of starting one for every chunk
+
+videos = [VideoPlayer(Video(r"resources\billiejean.mp4", shared_audio=True, persistent_audio=True), (0, 0, 426, 240)),
+          VideoPlayer(Video(r"resources\trailer1.mp4", shared_audio=True, persistent_audio=True), (426, 0, 256, 144)),
+          VideoPlayer(Video(r"resources\medic.mov", shared_audio=True, persistent_audio=True), (682, 0, 256, 144)),
+          VideoPlayer(Video(r"resources\trailer2.mp4", shared_audio=True, persistent_audio=True), (426, 144, 640, 360)),
+          VideoPlayer(Video(r"resources\clip.mp4", shared_audio=True, persistent_audio=True), (0, 240, 256, 144)),
+          VideoPlayer(Video(r"resources\birds.avi", shared_audio=True, persistent_audio=True), (0, 384, 426, 240)),
+          VideoPlayer(Video(r"resources\ocean.mkv", shared_audio=True, persistent_audio=True), (426, 504, 426, 240))]
 
 while True:
     for event in pygame.event.get():
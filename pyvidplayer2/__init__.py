@@ -27,6 +27,7 @@ VERSION = __version__  # for older versions of pyvidplayer2
 _ffmpeg_loglvl = "quiet"
 _ffmpeg_path = "ffmpeg"
 _ffprobe_path = "ffprobe"
+_cache_dir = None
 
 
 ##################################################
@@ -41,9 +42,14 @@ def get_ffmpeg_path() -> str:
 
 def get_ffprobe_path() -> str:
     return _ffprobe_path
+
+
+def get_cache_dir() -> str:
+    return _cache_dir
 ##################################################
 
 
+from . import probe_cache  # noqa: E402
 from .video import (READER_AUTO, READER_DECORD, READER_FFMPEG,  # noqa: E402
                     READER_IMAGEIO, READER_OPENCV)
 
@@ -123,11 +129,23 @@ def set_ffmpeg_loglevel(level: str) -> None:
 def set_ffmpeg_path(path: str) -> None:
     global _ffmpeg_path
     _ffmpeg_path = path
+    probe_cache.clear()  # results from a different binary may not match
 
 
 def set_ffprobe_path(path: str) -> None:
     global _ffprobe_path
     _ffprobe_path = path
+    probe_cache.clear()
+
+
+# probe results are always cached in memory, this also saves them to disk
+def set_cache_dir(path: str) -> None:
+    global _cache_dir
+    _cache_dir = path
+
+
+def clear_probe_cache() -> None:
+    probe_cache.clear()
 
 
 # cv2.setLogLevel(0) # silent
@@ -140,6 +158,7 @@ __all__ = ["READER_AUTO", "READER_DECORD", "READER_FFMPEG", "READER_IMAGEIO",
            "VideoPlayer", "VideoPyglet", "VideoPyQT",
            "VideoPySide", "VideoRaylib", "VideoStreamError", "VideoTkinter",
            "VideoWx", "Webcam", "WebcamNotFoundError",
-           "YTDLPError", "get_ffmpeg_loglevel", "get_ffmpeg_path",
-           "get_ffprobe_path", "get_version_info",
+           "YTDLPError", "clear_probe_cache", "get_cache_dir",
+           "get_ffmpeg_loglevel", "get_ffmpeg_path",
+           "get_ffprobe_path", "get_version_info", "set_cache_dir",
            "set_ffmpeg_loglevel", "set_ffmpeg_path", "set_ffprobe_path"]
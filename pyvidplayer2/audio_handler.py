@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 
 class AudioHandler(ABC):
     '''
@@ -17,6 +19,12 @@ class AudioHandler(ABC):
         Returns output device channels if available. Returns 0 otherwise.
         '''
 
+    def get_sample_rate(self) -> int:
+        '''
+        Returns the sample rate that loaded audio must have. Returns 0 if any sample rate is accepted.
+        '''
+        return 0
+
     @abstractmethod
     def close(self) -> None:
         '''
@@ -30,9 +38,9 @@ class AudioHandler(ABC):
         '''
 
     @abstractmethod
-    def load(self, audio_chunk: bytes) -> None:
+    def load(self, audio_chunk: np.ndarray, sample_rate: int) -> None:
         '''
-        Load an audio chunk into backend.
+        Load an audio chunk into backend. Chunks are 16 bit pcm arrays shaped (samples, channels).
         '''
 
     @abstractmethod
@@ -31,17 +31,53 @@ class CVReader(VideoReader):
         return self._vidcap.isOpened()
 
     def seek(self, index):
+        if self.frame_index is not None and 0 <= index < len(self.frame_index):
+            self._seek_from_keyframe(index)
+            return
+
         self._vidcap.set(cv2.CAP_PROP_POS_FRAMES, index)
         self.frame = int(self._vidcap.get(cv2.CAP_PROP_POS_FRAMES))
         if self.frame < 0:
             raise OpenCVError("Failed to seek.")
 
+    # opencv converts frame positions with the nominal frame rate, which drifts on long or variable frame rate videos
+    # seeking to a known keyframe by timestamp and grabbing forward lands on the exact frame
+    def _seek_from_keyframe(self, index):
+        keyframe = self.frame_index.get_keyframe(index)
+        while True:
+            if not self._vidcap.set(cv2.CAP_PROP_POS_MSEC, self.frame_index.pts[keyframe] * 1000):
+                raise OpenCVError("Failed to seek.")
+
+            # opencv still converts the time with the nominal frame rate, so it can land before or after the keyframe
+            # it reports the time of the last frame it decoded, which is looked up to find where reading continues
+            if self._vidcap.get(cv2.CAP_PROP_POS_FRAMES) > 0:
+                self.frame = self.frame_index.get_frame(self._vidcap.get(cv2.CAP_PROP_POS_MSEC) / 1000) + 1
+            else:
+                self.frame = 0
+
+            # frame only counts what was actually grabbed
+            if self.frame <= index:
+                while self.frame < index and self.grab():
+                    pass
+                if self.frame == index or keyframe == 0:
+                    return
+
+            # landed past the frame or the end of the file, so tries again from the keyframe before
+            keyframe = self.frame_index.get_keyframe(keyframe - 1)
+
     def read(self):
         has, frame = self._vidcap.read()
         if has:
             self.frame += 1
         return has, frame
 
+    # decodes but doesn't retrieve the frame
+    def grab(self):
+        has = self._vidcap.grab()
+        if has:
+            self.frame += 1
+        return has
+
     def release(self):
         self._vidcap.release()
         VideoReader.release(self)
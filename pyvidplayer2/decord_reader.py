@@ -42,6 +42,23 @@ class DecordReader(VideoReader):
 
         return has_frame, frame
 
+    # skipped frames are still decoded but never converted to numpy
+    def grab(self):
+        if self.frame >= len(self._vid_reader):
+            return False
+        self._vid_reader.skip_frames(1)
+        self.frame += 1
+        return True
+
+    # decord seeks between frames itself and decodes them all in one call
+    def read_batch(self, indices):
+        indices = [index for index in indices if index < len(self._vid_reader)]
+        if not indices:
+            return []
+        frames = self._vid_reader.get_batch(indices).asnumpy()
+        self.frame = indices[-1] + 1  # decord carries on after the last frame in the batch
+        return list(frames)
+
     def release(self):
         self._path = b''
         VideoReader.release(self)
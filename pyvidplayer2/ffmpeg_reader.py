@@ -9,13 +9,24 @@ from .video_reader import VideoReader
 
 
 class FFMPEGReader(VideoReader):
-    def __init__(self, path, probe=True, cuda_device=-1):
+    def __init__(self, path, probe=True, cuda_device=-1, buffer_pool=0):
         self._process = None
 
         VideoReader.__init__(self, path, probe)
 
         self.cuda_device = cuda_device
 
+        # frames are decoded into a rotating pool of preallocated arrays instead of new ones
+        # a returned frame is only valid until buffer_pool - 1 more frames have been read
+        self.buffer_pool = max(2, buffer_pool) if buffer_pool > 0 else 0
+        self._buffers = []
+        self._buffer_index = 0
+        self._skip_buffer = None  # scratch space for frames that are read and thrown away
+
+        # frames are scaled by ffmpeg while decoding, None keeps the original size
+        self.output_size = None
+        self.interp = "bicubic"
+
         self._colour_format = "BGR"
 
         self._path = path
@@ -58,17 +69,40 @@ class FFMPEGReader(VideoReader):
             *(["-hwaccel", "cuda"] if self.cuda_device >= 0 else []),
             # select device
             *(["-init_hw_device", f"cuda:{self.cuda_device}"] if self.cuda_device >= 0 else []),
-            *(["-ss", self._convert_seconds(index / self.frame_rate)] if index is not None else []),
+            *(["-ss", self._convert_seconds(self._get_seek_time(index))] if index is not None else []),
             "-i", self._path,
             "-loglevel", get_ffmpeg_loglevel(),
             "-map", "0:v:0",
             "-f", "rawvideo",
-            "-vf", "format=bgr24",
+            "-vf", f"{self._get_scale_filter()}format=bgr24",
             "-sn",
             "-an",
             "-"
         ]
 
+    def _get_seek_time(self, index):
+        if self.frame_index is not None:
+            return self.frame_index.get_seek_time(index)
+        return index / self.frame_rate
+
+    def _get_output_size(self):
+        return self.original_size if self.output_size is None else self.output_size
+
+    def _get_scale_filter(self):
+        size = self._get_output_size()
+        if size == self.original_size:
+            return ""
+        return f"scale={size[0]}:{size[1]}:flags={self.interp},"
+
+    def set_output_size(self, size, interp="bicubic"):
+        scale_filter = self._get_scale_filter()
+        self.output_size = tuple(size)
+        self.interp = interp
+
+        # restart the pipe so that frames come out at the new size
+        if self._get_scale_filter() != scale_filter:
+            self.seek(self.frame)
+
     def _convert_seconds(self, seconds):
         seconds = abs(seconds)
         d = str(seconds).rsplit('.', maxsplit=1)[-1] if '.' in str(seconds) else 0
@@ -78,8 +112,39 @@ class FFMPEGReader(VideoReader):
         s = int(seconds % 60)
         return f"{h}:{m}:{s}.{d}"
 
+    # fills the given buffer from the pipe, returns False if the video ended first
+    def _readinto(self, view):
+        n = 0
+        while n < len(view):
+            read = self._process.stdout.readinto(view[n:])
+            if not read:
+                return False
+            n += read
+        return True
+
+    def _read_into_buffer(self):
+        w, h = self._get_output_size()
+        shape = (h, w, 3)
+        if not self._buffers or self._buffers[0].shape != shape:
+            self._buffers = [np.empty(shape, np.uint8) for _ in range(self.buffer_pool)]
+            self._buffer_index = 0
+
+        frame = self._buffers[self._buffer_index]
+
+        if not self._readinto(memoryview(frame).cast("B")):
+            return False, None
+
+        self._buffer_index = (self._buffer_index + 1) % self.buffer_pool
+        self.frame += 1
+
+        return True, frame
+
     def read(self):
-        b = self._process.stdout.read(self.original_size[0] * self.original_size[1] * 3)
+        if self.buffer_pool:
+            return self._read_into_buffer()
+
+        w, h = self._get_output_size()
+        b = self._process.stdout.read(w * h * 3)
         if not b:
             has = False
         else:
@@ -88,10 +153,23 @@ class FFMPEGReader(VideoReader):
 
         frame = None
         if has:
-            frame = np.frombuffer(b, np.uint8).reshape((self.original_size[1], self.original_size[0], 3))
+            frame = np.frombuffer(b, np.uint8).reshape((h, w, 3))
 
         return has, frame
 
+    # discards a frame's bytes without creating an array for them
+    def grab(self):
+        w, h = self._get_output_size()
+        size = w * h * 3
+        if self._skip_buffer is None or len(self._skip_buffer) != size:
+            self._skip_buffer = memoryview(bytearray(size))
+
+        if not self._readinto(self._skip_buffer):
+            return False
+
+        self.frame += 1
+        return True
+
     def seek(self, index):
         self.frame = index
         FFMPEGReader._end_proc(self._process)
@@ -0,0 +1,78 @@
+# Long-lived ffmpeg process for resizing frames without OpenCV
+import subprocess
+from threading import Lock
+
+import numpy as np
+
+from . import get_ffmpeg_loglevel, get_ffmpeg_path
+from .error import FFmpegNotFoundError, Pyvidplayer2Error
+from .ffmpeg_reader import FFMPEGReader
+
+
+class FFmpegScaler:
+    '''
+    Keeps one ffmpeg process open for a fixed input size, output size and interpolation.
+    Raw frames are written to stdin one at a time, and each scaled frame is read back
+    before the next one is sent.
+    '''
+
+    def __init__(self, in_size, out_size, interp):
+        self.in_size = in_size
+        self.out_size = out_size
+        self.interp = interp
+
+        # frames can come from the decode-ahead thread too, so callers hold this while scaling
+        # close takes it as well, so a scaler can't be closed partway through a frame
+        self.lock = Lock()
+
+        try:
+            self._process = subprocess.Popen(
+                [
+                    get_ffmpeg_path(),
+                    "-loglevel", get_ffmpeg_loglevel(),
+                    "-f", "rawvideo",
+                    "-pix_fmt", "rgb24",
+                    "-s", f"{in_size[0]}x{in_size[1]}",
+                    # otherwise ffmpeg waits for several frames before outputting anything
+                    "-probesize", "32",
+                    "-analyzeduration", "0",
+                    "-i", "-",
+                    "-vf", f"scale={out_size[0]}:{out_size[1]}:flags={interp}",
+                    "-f", "rawvideo",
+                    "-pix_fmt", "rgb24",
+                    "-flush_packets", "1",
+                    "-"
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE
+            )
+        except FileNotFoundError as e:
+            raise FFmpegNotFoundError(
+                "Could not find FFmpeg. Make sure it's downloaded and accessible via PATH.") from e
+
+    # lock must be held
+    def scale(self, data):
+        frame = np.empty((self.out_size[1], self.out_size[0], 3), np.uint8)
+        view = memoryview(frame).cast("B")
+
+        try:
+            self._process.stdin.write(np.ascontiguousarray(data).data)
+            self._process.stdin.flush()
+        except (BrokenPipeError, ValueError) as e:
+            raise Pyvidplayer2Error("FFmpeg scaler stopped unexpectedly.") from e
+
+        n = 0
+        while n < len(view):
+            read = self._process.stdout.readinto(view[n:])
+            if not read:
+                raise Pyvidplayer2Error("FFmpeg scaler stopped unexpectedly.")
+            n += read
+
+        return frame
+
+    def close(self):
+        with self.lock:
+            if self._process.stdin:
+                self._process.stdin.close()
+            # borrow method to cleanly close processes
+            FFMPEGReader._end_proc(self._process)
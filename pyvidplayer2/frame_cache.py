@@ -0,0 +1,136 @@
+# Keeps decoded frames around so seeking back to them doesn't need the reader
+import os
+import tempfile
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from .frame_store import remove_temp_file
+
+
+class DiskFrameCache:
+    '''
+    Decoded frames kept in a memory-mapped temporary file, so revisited frames don't have to be
+    decoded again and don't take up RAM either. The file is split into equally sized slots when
+    the first frame is stored, and the least recently used frame is evicted once every slot is taken.
+    '''
+
+    def __init__(self, size_mb, directory=None):
+        self.max_bytes = int(size_mb * 1024 * 1024)
+        self.directory = directory
+
+        self.slots = OrderedDict()  # frame index -> slot in the file
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+        self._mmap = None
+        self._path = None
+        self._finalizer = None  # removes the file if the cache is garbage collected without being cleared
+        self._free = []
+
+    def __contains__(self, index):
+        return index in self.slots
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _allocate(self, data):
+        self.clear()
+
+        capacity = self.max_bytes // data.nbytes
+        if capacity < 1:
+            return False
+
+        fd, self._path = tempfile.mkstemp(suffix=".frames", dir=self.directory)
+        self._finalizer = weakref.finalize(self, remove_temp_file, self._path)
+        with os.fdopen(fd, "wb") as f:
+            f.truncate(capacity * data.nbytes)
+        self._mmap = np.memmap(self._path, dtype=data.dtype, mode="r+", shape=(capacity, *data.shape))
+        self._free = list(range(capacity - 1, -1, -1))
+        return True
+
+    def get(self, index):
+        slot = self.slots.get(index)
+        if slot is None:
+            self.stats["misses"] += 1
+            return None
+        self.slots.move_to_end(index)
+        self.stats["hits"] += 1
+        return np.array(self._mmap[slot])  # copied so later frames can reuse the slot
+
+    def put(self, index, data):
+        if index in self.slots:
+            return
+
+        # frames change size when the reader scales them differently
+        if self._mmap is None or self._mmap.shape[1:] != data.shape or self._mmap.dtype != data.dtype:
+            if not self._allocate(data):
+                return
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self.slots.popitem(last=False)[1]
+            self.stats["evicted"] += 1
+
+        self._mmap[slot] = data
+        self.slots[index] = slot
+
+    def clear(self):
+        self.slots.clear()
+        self._free.clear()
+        self._mmap = None
+        if self._path is not None:
+            self._finalizer()
+            self._path = None
+
+    def get_stats(self):
+        return dict(self.stats, frames=len(self.slots),
+                    max_frames=0 if self._mmap is None else len(self._mmap), max_bytes=self.max_bytes)
+
+
+class FrameCache:
+    '''
+    Least recently used decoded frames kept in memory, up to a size in bytes. Frames are copied
+    when stored, since readers may reuse their buffers.
+    '''
+
+    def __init__(self, size_mb):
+        self.max_bytes = int(size_mb * 1024 * 1024)
+
+        self.frames = OrderedDict()  # frame index -> frame
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+        self._bytes = 0
+
+    def __contains__(self, index):
+        return index in self.frames
+
+    def __len__(self):
+        return len(self.frames)
+
+    def get(self, index):
+        data = self.frames.get(index)
+        if data is None:
+            self.stats["misses"] += 1
+            return None
+        self.frames.move_to_end(index)
+        self.stats["hits"] += 1
+        return data
+
+    def put(self, index, data):
+        if index in self.frames or data.nbytes > self.max_bytes:
+            return
+
+        self.frames[index] = data.copy()
+        self._bytes += data.nbytes
+        while self._bytes > self.max_bytes:
+            self._bytes -= self.frames.popitem(last=False)[1].nbytes
+            self.stats["evicted"] += 1
+
+    def clear(self):
+        self.frames.clear()
+        self._bytes = 0
+
+    def get_stats(self):
+        return dict(self.stats, frames=len(self.frames), bytes=self._bytes, max_bytes=self.max_bytes)
@@ -0,0 +1,115 @@
+# Per-frame timestamps and keyframe positions, saved next to the probe cache so seeking can be exact
+import os
+import subprocess
+
+import numpy as np
+
+from . import get_ffmpeg_loglevel, get_ffprobe_path, probe_cache
+from .error import FFmpegNotFoundError
+
+
+class FrameIndex:
+    '''
+    Presentation timestamps of every frame in display order, starting at 0, and the
+    indices of frames that are keyframes. Readers use this to seek to exact frames
+    instead of estimating positions from the nominal frame rate.
+    '''
+
+    def __init__(self, pts, keyframes):
+        self.pts = np.asarray(pts, np.float64)
+        self.keyframes = np.asarray(keyframes, np.int64)
+
+    def __len__(self):
+        return len(self.pts)
+
+    # last keyframe at or before the given frame
+    def get_keyframe(self, index):
+        i = np.searchsorted(self.keyframes, index, side="right") - 1
+        return int(self.keyframes[i]) if i >= 0 else 0
+
+    # frame shown closest to the given time
+    def get_frame(self, time):
+        i = int(np.searchsorted(self.pts, time))
+        if i == len(self.pts) or (i > 0 and time - self.pts[i - 1] < self.pts[i] - time):
+            i -= 1
+        return max(i, 0)
+
+    # a time between the previous frame and the requested one, so rounding can't land on either neighbour
+    def get_seek_time(self, index):
+        index = min(max(index, 0), len(self.pts) - 1)
+        if index == 0:
+            return 0.0
+        return float(self.pts[index - 1] + self.pts[index]) / 2
+
+
+def build(path, as_bytes=False):
+    '''
+    Reads every video packet's timestamp and keyframe flag with a single FFprobe pass.
+    No frames are decoded, but the whole file is read.
+    '''
+    try:
+        command = [
+            get_ffprobe_path(),
+            "-i", "-" if as_bytes else path,
+            "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags",
+            "-loglevel", get_ffmpeg_loglevel(),
+            "-of", "csv=p=0"
+        ]
+
+        with subprocess.Popen(command,
+                              stdin=subprocess.PIPE if as_bytes else None,
+                              stdout=subprocess.PIPE) as p:
+            out = p.communicate(input=path if as_bytes else None)[0]
+    except FileNotFoundError as e:
+        raise FFmpegNotFoundError(
+            "Could not find FFprobe (should be bundled with FFmpeg). "
+            "Make sure FFprobe is installed and accessible via PATH.") from e
+
+    pts, keys = [], []
+    for line in out.split():
+        time, _, flags = line.partition(b",")
+        # packets without a timestamp or marked as discarded (e.g. trimmed by an edit list) aren't displayed
+        if time != b"N/A" and b"D" not in flags:
+            pts.append(time)
+            keys.append(b"K" in flags)
+
+    pts = np.array(pts, np.float64)
+
+    # packets are listed in decode order, frames are shown in presentation order
+    order = np.argsort(pts, kind="stable")
+    pts = pts[order]
+    if len(pts):
+        pts -= pts[0]
+
+    return FrameIndex(pts, np.flatnonzero(np.array(keys, bool)[order]))
+
+
+def load(path):
+    '''
+    Returns the saved index for a file, or None if it hasn't been built or the file has changed.
+    '''
+    index_path = probe_cache.get_sidecar_path(path, ".index.npz")
+    if index_path is None or not os.path.exists(index_path):
+        return None
+    try:
+        with np.load(index_path, allow_pickle=False) as data:
+            if str(data["key"]) != repr(probe_cache.get_file_key(path)):
+                return None
+            return FrameIndex(data["pts"], data["keyframes"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save(path, index):
+    index_path = probe_cache.get_sidecar_path(path, ".index.npz")
+    if index_path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        temp_path = f"{index_path}.{os.getpid()}.tmp.npz"
+        np.savez(temp_path, key=np.array(repr(probe_cache.get_file_key(path))),
+                 pts=index.pts, keyframes=index.keyframes)
+        os.replace(temp_path, index_path)
+    except OSError:
+        pass  # cache is best effort
@@ -0,0 +1,121 @@
+# Background decoder that keeps a bounded queue of ready frames ahead of playback
+from collections import deque
+from threading import Condition, Thread
+
+
+DROP_NONE = "none"
+DROP_LATE = "late"
+
+
+class FrameQueue:
+    '''
+    Decodes and processes frames on a worker thread so the render loop only pops finished frames.
+    Items are (has_frame, data, processed) tuples. Frames dropped by the "late" policy are
+    only grabbed, so they are queued without data.
+    '''
+
+    def __init__(self, read_func, grab_func, process_func, time_func, depth, drop_policy=DROP_LATE):
+        if drop_policy not in (DROP_NONE, DROP_LATE):
+            raise ValueError("Drop policy not recognized.")
+
+        self.read_func = read_func
+        self.grab_func = grab_func
+        self.process_func = process_func
+        self.time_func = time_func  # maps a frame index to its timestamp
+        self.depth = max(1, depth)
+        self.drop_policy = drop_policy
+
+        self.frames = deque()
+        self.pos = -1.0  # latest playback position, updated by the consumer
+        self.stats = {"decoded": 0, "dropped": 0, "popped": 0, "underruns": 0, "peak_depth": 0}
+
+        self._cond = Condition()
+        self._thread = None
+        self._running = False
+        self._finished = False
+        self._index = 0
+
+    def start(self, index):
+        self.stop()
+
+        self.frames.clear()
+        self.pos = -1.0
+        self._index = index
+        self._finished = False
+        self._running = True
+
+        self._thread = Thread(target=self._threaded_decode, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+            self._thread.join()
+            self._thread = None
+        self.frames.clear()
+
+    def get_running(self):
+        return self._thread is not None
+
+    def _threaded_decode(self):
+        while self._running:
+            with self._cond:
+                while self._running and len(self.frames) >= self.depth:
+                    self._cond.wait()
+                if not self._running:
+                    break
+
+            # the consumer skips a frame once the next one is due, so don't bother converting it
+            if self.drop_policy == DROP_LATE and self.pos > self.time_func(self._index + 1):
+                has_frame, data = self.grab_func(), None
+                processed = False
+                if has_frame:
+                    self.stats["dropped"] += 1
+            else:
+                has_frame, data = self.read_func()
+                processed = has_frame
+                if has_frame:
+                    data = self.process_func(data)
+            if has_frame:
+                self.stats["decoded"] += 1
+            self._index += 1
+
+            with self._cond:
+                if not self._running:
+                    break
+                self.frames.append((has_frame, data, processed))
+                self.stats["peak_depth"] = max(self.stats["peak_depth"], len(self.frames))
+                self._finished = not has_frame
+                self._cond.notify_all()
+
+            if not has_frame:
+                break
+
+    # returns None if the next frame is not ready yet
+    def pop(self):
+        with self._cond:
+            if not self.frames:
+                if not self._finished:
+                    self.stats["underruns"] += 1
+                return None
+            self.stats["popped"] += 1
+            item = self.frames.popleft()
+            self._cond.notify_all()
+            return item
+
+    # blocks until the next frame is ready
+    def get(self):
+        with self._cond:
+            while not self.frames and self._running and not self._finished:
+                self._cond.wait()
+            if not self.frames:
+                return False, None, False
+            self.stats["popped"] += 1
+            item = self.frames.popleft()
+            self._cond.notify_all()
+            return item
+
+    def get_stats(self):
+        return dict(self.stats, depth=len(self.frames), max_depth=self.depth, drop_policy=self.drop_policy)
@@ -0,0 +1,153 @@
+# Compact storage for preloaded frames, so long videos don't need every raw frame in memory
+import importlib.util
+import os
+import tempfile
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+CV = 0
+if importlib.util.find_spec("cv2") is not None:
+    CV = 1
+    import cv2
+
+STORE_RAW = "raw"
+STORE_JPG = "jpg"
+STORE_PNG = "png"
+STORE_MEMMAP = "memmap"
+
+
+def remove_temp_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class FrameStore:
+    '''
+    List-like container for preloaded frames. Raw frames are kept as they are. Otherwise frames
+    are encoded as JPEG or PNG with OpenCV, or written one after another into a temporary
+    memory-mapped file, and can be downscaled first. Those frames are decoded again when
+    accessed, and the most recently used ones are kept until they exceed the memory budget.
+    '''
+
+    def __init__(self, storage=STORE_RAW, scale=1.0, cache_mb=64.0, quality=90):
+        if storage not in (STORE_RAW, STORE_JPG, STORE_PNG, STORE_MEMMAP):
+            raise ValueError("Frame storage not recognized.")
+        if storage in (STORE_JPG, STORE_PNG) and not CV:
+            raise ModuleNotFoundError(
+                "OpenCV is not installed. Install it via pip or use a different frame storage.")
+
+        self.storage = storage
+        self.scale = min(max(scale, 0.01), 1.0)
+        self.cache_size = int(cache_mb * 1024 * 1024)
+        self.quality = quality
+
+        self.stats = {"hits": 0, "misses": 0}
+
+        self._frames = []  # raw or encoded frames
+        self._cache = OrderedDict()  # index -> decoded frame
+        self._cache_bytes = 0
+
+        self._mmap = None
+        self._mmap_path = None
+        self._mmap_finalizer = None  # removes the file if the store is garbage collected without being cleared
+        self._count = 0  # frames written to the memory-mapped file
+
+    def __len__(self):
+        return self._count if self.storage == STORE_MEMMAP else len(self._frames)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Frame index out of range.")
+
+        if self.storage == STORE_RAW:
+            return self._frames[index]
+
+        data = self._cache.get(index)
+        if data is not None:
+            self._cache.move_to_end(index)
+            self.stats["hits"] += 1
+            return data
+
+        self.stats["misses"] += 1
+        if self.storage == STORE_MEMMAP:
+            data = np.array(self._mmap[index])  # copied so the file can be closed
+        else:
+            data = cv2.imdecode(self._frames[index], cv2.IMREAD_UNCHANGED)
+
+        self._cache[index] = data
+        self._cache_bytes += data.nbytes
+        while self._cache_bytes > self.cache_size and len(self._cache) > 1:
+            self._cache_bytes -= self._cache.popitem(last=False)[1].nbytes
+        return data
+
+    def _shrink(self, data):
+        h, w = data.shape[:2]
+        size = (max(1, round(w * self.scale)), max(1, round(h * self.scale)))
+        if size == (w, h):
+            return data
+        if CV:
+            return cv2.resize(data, dsize=size, interpolation=cv2.INTER_AREA)
+        rows = np.linspace(0, h - 1, size[1]).astype(int)
+        cols = np.linspace(0, w - 1, size[0]).astype(int)
+        return data[rows][:, cols]
+
+    def _grow_mmap(self, data):
+        if self._mmap is None:
+            fd, self._mmap_path = tempfile.mkstemp(suffix=".frames")
+            os.close(fd)
+            self._mmap_finalizer = weakref.finalize(self, remove_temp_file, self._mmap_path)
+        elif self._mmap.shape[1:] != data.shape:
+            raise ValueError("Frames stored in a memory-mapped file must all be the same size.")
+
+        capacity = max(16, self._count * 2)
+        self._mmap = None  # unmapped before the file is resized
+        with open(self._mmap_path, "r+b") as f:
+            f.truncate(capacity * data.nbytes)
+        self._mmap = np.memmap(self._mmap_path, dtype=data.dtype, mode="r+", shape=(capacity, *data.shape))
+
+    def append(self, data):
+        data = self._shrink(data)
+
+        if self.storage == STORE_RAW:
+            self._frames.append(data)
+        elif self.storage == STORE_MEMMAP:
+            if self._mmap is None or self._count == len(self._mmap) or self._mmap.shape[1:] != data.shape:
+                self._grow_mmap(data)
+            self._mmap[self._count] = data
+            self._count += 1
+        else:
+            params = [cv2.IMWRITE_JPEG_QUALITY, self.quality] if self.storage == STORE_JPG else []
+            success, encoded = cv2.imencode(f".{self.storage}", data, params)
+            if not success:
+                raise ValueError("Could not encode frame.")
+            self._frames.append(encoded)
+
+    def clear(self):
+        self._frames.clear()
+        self._cache.clear()
+        self._cache_bytes = 0
+        self._count = 0
+        self._mmap = None
+        if self._mmap_path is not None:
+            self._mmap_finalizer()
+            self._mmap_path = None
+
+    # bytes held by stored frames, not counting decoded frames in the cache
+    def get_size(self):
+        if self.storage == STORE_MEMMAP:
+            return 0
+        return sum(frame.nbytes for frame in self._frames)
+
+    def get_stats(self):
+        return dict(self.stats, frames=len(self), storage=self.storage, stored_bytes=self.get_size(),
+                    cached_bytes=self._cache_bytes, cache_size=self.cache_size)
@@ -33,6 +33,10 @@ class IIOReader(VideoReader):
         self.frame = index
         self._gen = new_gen
 
+    # seeking decodes every frame from the start, so reading forward is always cheaper
+    def _should_seek(self, index):
+        return index < self.frame
+
     def read(self):
         has = False
         frame = None
@@ -1,3 +1,4 @@
+import struct
 from io import BytesIO
 
 import pygame
@@ -20,8 +21,17 @@ class MixerHandler(AudioHandler):
     def get_busy(self):
         return pygame.mixer.music.get_busy()
 
-    def load(self, audio_chunk):
-        pygame.mixer.music.load(BytesIO(audio_chunk), "wav")
+    def _get_wav_header(self, size, sample_rate, channels):
+        # minimal 16 bit pcm header, which is all pygame needs to play raw samples
+        return struct.pack("<4sI4s4sIHHIIHH4sI",
+                           b"RIFF", 36 + size, b"WAVE",
+                           b"fmt ", 16, 1, channels, sample_rate,
+                           sample_rate * channels * 2, channels * 2, 16,
+                           b"data", size)
+
+    def load(self, audio_chunk, sample_rate):
+        header = self._get_wav_header(audio_chunk.nbytes, sample_rate, audio_chunk.shape[1])
+        pygame.mixer.music.load(BytesIO(b"".join((header, audio_chunk.data))), "wav")
         self.loaded = True
 
     def get_num_channels(self):
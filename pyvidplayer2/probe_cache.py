@@ -0,0 +1,122 @@
+# Remembers ffprobe/ffmpeg results so reopening the same file doesn't spawn the same subprocesses again
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
+
+from . import get_cache_dir
+
+MAX_ENTRIES = 64
+
+_entries = OrderedDict()  # file key -> {section: result}
+_lock = Lock()
+
+
+def get_file_key(path):
+    '''
+    Identifies a local file by its absolute path, size and modification time,
+    so edited or replaced files are probed again. Returns None for anything
+    that can't be cached, such as bytes, urls or missing files.
+    '''
+    if not isinstance(path, str):
+        return None
+    try:
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def _get_disk_path(key, suffix=".json"):
+    cache_dir = get_cache_dir()
+    if cache_dir is None or key is None:
+        return None
+    return os.path.join(cache_dir, hashlib.sha1(repr(key).encode()).hexdigest() + suffix)
+
+
+def get_sidecar_path(path, suffix):
+    '''
+    Where larger per-file data such as frame indices are saved in the cache directory.
+    Returns None if there is no cache directory or the file can't be cached.
+    '''
+    return _get_disk_path(get_file_key(path), suffix)
+
+
+def _load_disk(key):
+    disk_path = _get_disk_path(key)
+    if disk_path is None:
+        return None
+    try:
+        with open(disk_path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # guards against hash collisions and files from other versions
+    if data.get("key") != list(key):
+        return None
+    return data.get("sections", {})
+
+
+def _save_disk(key, sections):
+    disk_path = _get_disk_path(key)
+    if disk_path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+        temp_path = f"{disk_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"key": list(key), "sections": sections}, f)
+        os.replace(temp_path, disk_path)  # readers never see a half written file
+    except OSError:
+        pass  # cache is best effort
+
+
+def _get_sections(key):
+    sections = _entries.get(key)
+    if sections is None:
+        sections = _load_disk(key)
+        if sections is None:
+            return None
+        _entries[key] = sections
+    _entries.move_to_end(key)
+    while len(_entries) > MAX_ENTRIES:
+        _entries.popitem(last=False)
+    return sections
+
+
+def load(path, section):
+    '''
+    Returns the cached result of a probe, or None if it needs to be run.
+    '''
+    key = get_file_key(path)
+    if key is None:
+        return None
+    with _lock:
+        sections = _get_sections(key)
+        if sections is None:
+            return None
+        return sections.get(section)
+
+
+def store(path, section, result):
+    '''
+    Saves a probe result in memory, and on disk if a cache directory is set.
+    Results must be json serializable.
+    '''
+    key = get_file_key(path)
+    if key is None:
+        return
+    with _lock:
+        sections = _get_sections(key)
+        if sections is None:
+            sections = _entries[key] = {}
+        sections[section] = result
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+        _save_disk(key, sections)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
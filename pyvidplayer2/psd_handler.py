@@ -1,8 +1,3 @@
-import time
-import wave
-from io import BytesIO
-from threading import Thread
-
 import numpy as np
 import sounddevice as sd
 
@@ -10,16 +5,59 @@ from .audio_handler import AudioHandler
 from .error import AudioDeviceError
 
 
+class RingBuffer:
+    '''
+    Preallocated buffer of audio samples shared between one writer and one reader.
+    The writer only moves write_count and discard_count, and the reader only moves
+    read_count, so neither side needs a lock.
+    '''
+
+    def __init__(self, capacity, channels):
+        self.data = np.zeros((capacity, channels), np.int16)
+        self.capacity = capacity
+        self.channels = channels
+        self.read_count = 0
+        self.write_count = 0
+        self.discard_count = 0  # everything before this is skipped by the reader
+
+    def _get_read_start(self):
+        return max(self.read_count, self.discard_count)
+
+    def get_available(self):
+        return self.write_count - self._get_read_start()
+
+    def write(self, audio):
+        n = min(len(audio), self.capacity - self.get_available())
+        start = self.write_count % self.capacity
+        first = min(n, self.capacity - start)
+        self.data[start:start + first] = audio[:first]
+        self.data[:n - first] = audio[first:n]
+        self.write_count += n
+        return n
+
+    def read_into(self, out):
+        read_start = self._get_read_start()
+        n = min(len(out), self.write_count - read_start)
+        start = read_start % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self.data[start:start + first]
+        out[first:n] = self.data[:n - first]
+        self.read_count = read_start + n
+        return n
+
+    def discard(self):
+        self.discard_count = self.write_count
+
+
 class PSDHandler(AudioHandler):
     def __init__(self):
         self.stream = None
-        self.wave = None
-
-        self.thread = None
-        self.stop_thread = False
+        self.ring = None
 
-        self.position = 0
-        self.chunks_played = 0
+        self.frames_played = 0
+        # (first frame, number of frames, dac time) of the last block given to the device
+        self._last_block = (0, 0, 0.0)
+        self._paused_pos = 0.0
 
         self.loaded = False
         self.paused = False
@@ -63,45 +101,52 @@ class PSDHandler(AudioHandler):
             ) from e
         self.device_index = index
 
-    def load(self, audio_chunk):
+    def _open_stream(self, sample_rate, channels):
+        # order is important
+        sample_rates = [
+            sample_rate,
+            int(self.audio_devices[self.device_index]["default_samplerate"])
+        ]
+        psd_exception = None
+
+        for sr in sample_rates:
+            try:
+                self.stream = sd.OutputStream(
+                    samplerate=sr,
+                    channels=channels,
+                    device=self.device_index,
+                    dtype="int16",
+                    callback=self._callback
+                )
+                self.stream.start()
+                break
+            except sd.PortAudioError as e:
+                psd_exception = e
+        else:
+            raise AudioDeviceError(
+                "Failed to open audio stream with device \"{}\"".format(
+                    self.audio_devices[self.device_index]["name"])
+            ) from psd_exception
+
+    def load(self, audio_chunk, sample_rate):
         self.unload()
 
-        try:
-            self.wave = wave.open(BytesIO(audio_chunk), "rb")
-        except EOFError as e:
+        if len(audio_chunk) == 0:
             raise EOFError(
                 "Audio is empty. This may mean the file is corrupted."
                 " If your video has no audio track,"
                 " try initializing it with no_audio=True."
                 " If it has several tracks, make sure the correct one"
                 " is selected with the audio_track parameter."
-            ) from e
+            )
 
         if self.stream is None:
-            # order is important
-            sample_rates = [
-                self.wave.getframerate(),
-                int(self.audio_devices[self.device_index]["default_samplerate"])
-            ]
-            psd_exception = None
-
-            for sr in sample_rates:
-                try:
-                    self.stream = sd.OutputStream(
-                        samplerate=sr,
-                        channels=self.wave.getnchannels(),
-                        device=self.device_index,
-                        dtype=f'int{self.wave.getsampwidth() * 8}'
-                    )
-                    self.stream.start()
-                    break
-                except sd.PortAudioError as e:
-                    psd_exception = e
-            else:
-                raise AudioDeviceError(
-                    "Failed to open audio stream with device \"{}\"".format(
-                        self.audio_devices[self.device_index]["name"])
-                ) from psd_exception
+            self._open_stream(sample_rate, audio_chunk.shape[1])
+
+        # only reallocate when a chunk doesn't fit
+        if self.ring is None or self.ring.capacity < len(audio_chunk) or self.ring.channels != audio_chunk.shape[1]:
+            self.ring = RingBuffer(len(audio_chunk), audio_chunk.shape[1])
+        self.ring.write(audio_chunk)
 
         self.loaded = True
 
@@ -109,65 +154,51 @@ class PSDHandler(AudioHandler):
         return self.audio_devices[self.device_index]["max_output_channels"]
 
     def play(self):
-        self.stop_thread = False
-        self.position = 0
-        self.chunks_played = 0
+        self.frames_played = 0
+        self._last_block = (0, 0, 0.0)
+        self._paused_pos = 0.0
         self.active = True
 
-        self.wave.rewind()
-        self.thread = Thread(target=self._threaded_play, daemon=True)
-        self.thread.start()
-
-    def _threaded_play(self):
-        chunk_size = 128
-        channels = self.wave.getnchannels()
-        dtype_val = {1: np.int8, 2: np.int16, 4: np.int32}.get(self.wave.getsampwidth(), np.int16)
+    # reads the next block of audio from the ring buffer, applying volume in place
+    # returns how many frames were read, the rest of the block is silence
+    def _fill_block(self, audio, dac_time):
+        n = 0
+        if self.active and not self.paused:
+            n = self.ring.read_into(audio)
+        audio[n:] = 0
 
-        while not self.stop_thread:
-            if self.paused:
-                time.sleep(0.01)
-            else:
-                data = self.wave.readframes(chunk_size)
-                if data == b"":
-                    break
+        if self.volume == 0.0 or self.muted:
+            audio.fill(0)
+        elif self.volume != 1.0:
+            np.multiply(audio, self.volume, out=audio, casting="unsafe")
 
-                audio = np.frombuffer(data, dtype=dtype_val)
+        self._last_block = (self.frames_played, n, dac_time)
+        self.frames_played += n
 
-                audio = audio.reshape(-1, channels)
+        if self.active and not self.paused and self.ring.get_available() == 0:
+            self.active = False
 
-                if self.volume == 0.0 or self.muted:
-                    audio = np.zeros_like(audio)
-                elif self.volume != 1.0:
-                    audio = (audio * self.volume).astype(dtype_val)
+        return n
 
-                self._buffer = audio
+    # called by portaudio from its own thread whenever the device needs more audio
+    def _callback(self, outdata, frames, time, status):
+        if self._buffer is None or self._buffer.shape != outdata.shape:
+            self._buffer = np.zeros(outdata.shape, np.int16)
 
-                # having psd bubble its exceptions clutter the stack trace
-                # almost always due to handling an existing exception
-                try:
-                    self.stream.write(audio)
-                except sd.PortAudioError:
-                    break
-
-                self.chunks_played += chunk_size
-                self.position = self.chunks_played / float(self.wave.getframerate())
-
-        self.active = False
+        self._fill_block(self._buffer, time.outputBufferDacTime)
+        outdata[:] = self._buffer
 
     def stop(self):
         if self.loaded:
-            self.stop_thread = True
-            if self.thread and self.thread.is_alive():
-                self.thread.join()
-            self.position = 0
-            self.chunks_played = 0
+            self.active = False
+            self.frames_played = 0
+            self._last_block = (0, 0, 0.0)
+            self._paused_pos = 0.0
 
     def unload(self):
         if self.loaded:
             self.stop()
-            self.wave.close()
-            self.wave = None
-            self.thread = None
+            self.ring.discard()
             self.loaded = False
 
     def close(self):
@@ -185,9 +216,27 @@ class PSDHandler(AudioHandler):
         return self.volume
 
     def get_pos(self):
-        return self.position
+        if not self.loaded:
+            return 0
+
+        # blocks already handed over keep playing briefly, but position should stop right away
+        if self.paused:
+            return self._paused_pos
+
+        # interpolates within the block the device is currently playing,
+        # using the stream clock rather than how much audio has been handed over
+        start, frames, dac_time = self._last_block
+        sample_rate = self.stream.samplerate
+        # nothing is in flight once the ring buffer runs dry, so there is no latency to compensate for
+        if frames == 0:
+            return start / sample_rate
+        # some host apis don't report timing, in which case the whole block counts as played
+        elapsed = self.stream.time - dac_time if dac_time else frames / sample_rate
+        return max(0.0, start / sample_rate + min(elapsed, frames / sample_rate))
 
     def pause(self):
+        if not self.paused:
+            self._paused_pos = self.get_pos()
         self.paused = True
 
     def unpause(self):
@@ -0,0 +1,120 @@
+from threading import RLock
+
+import numpy as np
+import sounddevice as sd
+
+from .error import AudioDeviceError
+from .psd_handler import PSDHandler
+
+
+class PSDMixer:
+    '''
+    Owns a single Sounddevice output stream for an audio device and mixes every
+    registered source into it. Shared by all videos playing on the same device.
+    '''
+
+    mixers = {}  # device index -> mixer
+    # videos can be opened on other threads, e.g. a video player's next video in the queue
+    # held while a mixer is looked up and joined, or left and closed, so a device never gets two
+    _lock = RLock()
+
+    def __init__(self, device_index, device):
+        self.device_index = device_index
+        self.sample_rate = int(device["default_samplerate"])
+        self.channels = min(2, device["max_output_channels"])
+
+        # replaced instead of modified so the callback can iterate without a lock
+        self.sources = ()
+
+        self._mix = None
+        self._block = None
+
+        try:
+            self.stream = sd.OutputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                device=device_index,
+                dtype="int16",
+                callback=self._callback
+            )
+            self.stream.start()
+        except sd.PortAudioError as e:
+            raise AudioDeviceError(
+                f"Failed to open audio stream with device \"{device['name']}\""
+            ) from e
+
+    # returns the device's mixer with the source added, opening the mixer if needed
+    @classmethod
+    def join(cls, device_index, audio_devices, source):
+        with cls._lock:
+            if device_index not in cls.mixers:
+                cls.mixers[device_index] = cls(device_index, audio_devices[device_index])
+            mixer = cls.mixers[device_index]
+            mixer.add_source(source)
+            return mixer
+
+    def add_source(self, source):
+        with PSDMixer._lock:
+            if source not in self.sources:
+                self.sources = self.sources + (source,)
+
+    def remove_source(self, source):
+        with PSDMixer._lock:
+            self.sources = tuple(s for s in self.sources if s is not source)
+            if not self.sources:
+                self.close()
+
+    def close(self):
+        with PSDMixer._lock:
+            if PSDMixer.mixers.get(self.device_index) is self:
+                del PSDMixer.mixers[self.device_index]
+        self.stream.stop()
+        self.stream.close()
+
+    def _callback(self, outdata, frames, time, status):
+        if self._mix is None or self._mix.shape != outdata.shape:
+            self._mix = np.zeros(outdata.shape, np.float32)
+            self._block = np.zeros(outdata.shape, np.int16)
+
+        self._mix.fill(0)
+
+        for source in self.sources:
+            block = self._block[:, :source.ring.channels] if source.ring is not None else self._block
+            if source._fill_block(block, time.outputBufferDacTime):
+                # mono sources are broadcast across every output channel
+                if block.shape[1] == 1:
+                    self._mix += block
+                else:
+                    self._mix[:, :block.shape[1]] += block
+
+        np.clip(self._mix, -32768, 32767, out=self._mix)
+        outdata[:] = self._mix
+
+
+class PSDMixerHandler(PSDHandler):
+    '''
+    Sounddevice handler that plays through a shared PSDMixer instead of opening
+    its own output stream.
+    '''
+
+    def __init__(self):
+        PSDHandler.__init__(self)
+        self.mixer = None
+
+    # joins the device's mixer instead of opening a new stream
+    def _open_stream(self, sample_rate, channels):
+        self.mixer = PSDMixer.join(self.device_index, self.audio_devices, self)
+        self.stream = self.mixer.stream
+
+    def get_num_channels(self):
+        return min(2, self.audio_devices[self.device_index]["max_output_channels"])
+
+    def get_sample_rate(self):
+        return int(self.audio_devices[self.device_index]["default_samplerate"])
+
+    def close(self):
+        self.unload()
+        if self.mixer is not None:
+            self.mixer.remove_source(self)
+            self.mixer = None
+            self.stream = None
@@ -0,0 +1,109 @@
+# Decodes short segments backward from the playback position so reversed videos don't need every frame in memory
+from collections import OrderedDict
+from threading import Lock, Thread
+
+
+class ReverseBuffer:
+    '''
+    Serves frames for reverse playback. When a frame isn't cached, the segment ending at it is
+    decoded forward from its start (ideally a keyframe), and the segment before that is decoded on
+    a worker thread while the current one plays. Only a few segments are kept, so memory use
+    depends on the segment length instead of the length of the video.
+    '''
+
+    def __init__(self, seek_func, read_func, start_func, end_func=None, max_segments=2):
+        self.seek_func = seek_func
+        self.read_func = read_func
+        self.start_func = start_func  # maps a frame index to the first frame of the segment ending at it
+        self.end_func = end_func  # called with the real frame count when frames run out before an index
+        self.max_segments = max(2, max_segments)
+
+        self.segments = OrderedDict()  # first frame index -> list of frames
+        self.stats = {"decoded": 0, "segments": 0, "prefetched": 0, "misses": 0, "peak_frames": 0}
+
+        self._lock = Lock()
+        self._thread = None
+
+    def _find(self, index):
+        with self._lock:
+            for start, frames in self.segments.items():
+                if start <= index < start + len(frames):
+                    self.segments.move_to_end(start)
+                    return start, frames[index - start]
+        return None, None
+
+    def _decode(self, index):
+        start = self.start_func(index)
+        self.seek_func(start)
+
+        frames = []
+        for _ in range(start, index + 1):
+            has_frame, data = self.read_func()
+            if not has_frame:
+                break
+            frames.append(data)
+
+        # frame counts can be estimates that overshoot the end of the video
+        if len(frames) < index - start + 1 and self.end_func is not None:
+            self.end_func(start + len(frames))
+        if not frames:
+            return
+
+        with self._lock:
+            self.segments[start] = frames
+            self.segments.move_to_end(start)
+            while len(self.segments) > self.max_segments:
+                self.segments.popitem(last=False)
+            self.stats["decoded"] += len(frames)
+            self.stats["segments"] += 1
+            self.stats["peak_frames"] = max(self.stats["peak_frames"], sum(map(len, self.segments.values())))
+
+    def _threaded_prefetch(self, index):
+        self._decode(index)
+        with self._lock:
+            self.stats["prefetched"] += 1
+
+    def _prefetch(self, index):
+        if index < 0 or self._thread is not None or self._find(index)[0] is not None:
+            return
+        self._thread = Thread(target=self._threaded_prefetch, args=(index,), daemon=True)
+        self._thread.start()
+
+    # waits for the worker, which may be using the reader
+    def stop(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def clear(self):
+        self.stop()
+        with self._lock:
+            self.segments.clear()
+
+    # returns None if the frame could not be decoded
+    def get(self, index):
+        if index < 0:
+            return None
+
+        start, data = self._find(index)
+        if start is None:
+            # the worker might be decoding this frame already
+            self.stop()
+            start, data = self._find(index)
+            if start is None:
+                with self._lock:
+                    self.stats["misses"] += 1
+                self._decode(index)
+                start, data = self._find(index)
+                if start is None:
+                    return None
+        elif self._thread is not None and not self._thread.is_alive():
+            self.stop()
+
+        self._prefetch(start - 1)
+        return data
+
+    def get_stats(self):
+        with self._lock:
+            frames = sum(map(len, self.segments.values()))
+        return dict(self.stats, frames=frames, segments_cached=len(self.segments))
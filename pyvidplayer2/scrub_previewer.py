@@ -0,0 +1,98 @@
+# Decodes previews on a worker thread while scrubbing, so dragging along the progress bar never waits on a decoder
+from threading import Condition, Thread
+
+from .error import Pyvidplayer2Error
+
+
+class ScrubPreviewer:
+    '''
+    Decodes a preview frame for the most recently requested time on a worker thread. A request made
+    while another frame is being decoded replaces any request still waiting, so only the latest
+    position is decoded next and the ones in between are dropped. Finished frames are picked up
+    with poll, and cancel discards everything that hasn't been picked up yet.
+    '''
+
+    def __init__(self, read_func):
+        self.read_func = read_func  # decodes a frame for a time, or returns None if there's nothing new to show
+
+        self.stats = {"requested": 0, "decoded": 0, "dropped": 0, "failed": 0}
+
+        self._cond = Condition()
+        self._thread = None
+        self._pending = None  # time waiting to be decoded
+        self._result = None  # decoded frame waiting to be picked up
+        self._busy = False
+        self._generation = 0  # bumped on cancel, so frames decoded before it are thrown away
+        self._stop = False
+
+    def _threaded_decode(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return
+                time, self._pending = self._pending, None
+                generation = self._generation
+                self._busy = True
+
+            try:
+                data = self.read_func(time)
+            except Pyvidplayer2Error:
+                data = None
+                with self._cond:
+                    self.stats["failed"] += 1
+
+            with self._cond:
+                self._busy = False
+                if data is not None and generation == self._generation:
+                    self._result = data
+                    self.stats["decoded"] += 1
+                self._cond.notify_all()
+
+    def request(self, time):
+        with self._cond:
+            if self._pending is not None:
+                self.stats["dropped"] += 1
+            self._pending = time
+            self.stats["requested"] += 1
+            self._cond.notify_all()
+
+        if self._thread is None:
+            self._thread = Thread(target=self._threaded_decode, daemon=True)
+            self._thread.start()
+
+    # returns the latest decoded frame, or None if there isn't a new one
+    def poll(self):
+        with self._cond:
+            data, self._result = self._result, None
+        return data
+
+    def cancel(self):
+        with self._cond:
+            if self._pending is not None:
+                self.stats["dropped"] += 1
+            self._pending = None
+            self._result = None
+            self._generation += 1
+
+    # waits until every request has been decoded
+    def join(self):
+        with self._cond:
+            while self._thread is not None and (self._pending is not None or self._busy):
+                self._cond.wait()
+
+    # waits for the worker, which may be using a reader
+    def stop(self):
+        self.cancel()
+        if self._thread is not None:
+            with self._cond:
+                self._stop = True
+                self._cond.notify_all()
+            self._thread.join()
+            self._thread = None
+            self._stop = False
+
+    def get_stats(self):
+        with self._cond:
+            return dict(self.stats, busy=self._busy or self._pending is not None)
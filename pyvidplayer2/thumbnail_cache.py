@@ -0,0 +1,64 @@
+# Saves preview thumbnails as one sprite sheet, so reopening a file doesn't decode them again
+import json
+import math
+import os
+
+import pygame
+
+from . import probe_cache
+
+SHEET_COLUMNS = 16
+
+
+def _get_paths(path, count, size):
+    suffix = f".thumbs.{count}.{size[0]}x{size[1]}"
+    sheet_path = probe_cache.get_sidecar_path(path, suffix + ".png")
+    if sheet_path is None:
+        return None, None
+    return sheet_path, probe_cache.get_sidecar_path(path, suffix + ".json")
+
+
+def load(path, count, size):
+    '''
+    Returns the saved thumbnails for a file as subsurfaces of its sprite sheet, or None
+    if they haven't been saved or the file has changed.
+    '''
+    sheet_path, index_path = _get_paths(path, count, size)
+    if sheet_path is None or not os.path.exists(index_path):
+        return None
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        if index.get("key") != repr(probe_cache.get_file_key(path)):
+            return None
+        sheet = pygame.image.load(sheet_path)
+        return [sheet.subsurface((x, y, *size)) for x, y in index["positions"]]
+    except (OSError, ValueError, KeyError, pygame.error):
+        return None
+
+
+def save(path, count, size, thumbnails):
+    sheet_path, index_path = _get_paths(path, count, size)
+    if sheet_path is None:
+        return
+
+    columns = min(len(thumbnails), SHEET_COLUMNS)
+    sheet = pygame.Surface((columns * size[0], math.ceil(len(thumbnails) / columns) * size[1]))
+    positions = []
+    for i, surf in enumerate(thumbnails):
+        positions.append(((i % columns) * size[0], (i // columns) * size[1]))
+        sheet.blit(surf, positions[-1])
+
+    try:
+        os.makedirs(os.path.dirname(sheet_path), exist_ok=True)
+        temp_path = f"{sheet_path}.{os.getpid()}.tmp.png"
+        pygame.image.save(sheet, temp_path)
+        os.replace(temp_path, sheet_path)
+
+        # written after the sheet, so an index is never found without its sheet
+        temp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"key": repr(probe_cache.get_file_key(path)), "positions": positions}, f)
+        os.replace(temp_path, index_path)
+    except (OSError, pygame.error):
+        pass  # cache is best effort
@@ -0,0 +1,95 @@
+# Decodes preview thumbnails in the background so video players can be used right away
+from threading import Lock, Thread
+
+from .error import Pyvidplayer2Error
+
+
+class ThumbnailLoader:
+    '''
+    Fills a list of thumbnails from a few worker threads, each with its own reader so the video's
+    reader is never moved. Frames are handed out to the workers in turn, so thumbnails appear across
+    the whole timeline at once instead of from front to back. Slots stay None until loaded.
+    The last index is searched for backward, since frame counts can be estimates.
+    '''
+
+    def __init__(self, open_func, load_func, indices, workers=2, done_func=None):
+        self.open_func = open_func  # opens a new reader for the video
+        self.load_func = load_func  # turns a decoded frame into a thumbnail
+        self.done_func = done_func  # called from the last worker with the thumbnails once all have loaded
+        self.indices = indices
+        self.workers = max(1, min(workers, len(indices)))
+
+        self.thumbnails = [None] * len(indices)
+        self.stats = {"loaded": 0, "failed": 0}
+
+        self._lock = Lock()
+        self._threads = []
+        self._finished = 0
+        self._stop = False
+
+    def _read(self, reader, index, last):
+        while index >= 0 and not self._stop:
+            frames = reader.read_batch([index])
+            if frames:
+                return frames[0]
+            if not last:
+                return None
+            index -= 1
+        return None
+
+    def _threaded_load(self, slots):
+        try:
+            self._load(slots)
+        finally:
+            with self._lock:
+                self._finished += 1
+                done = self._finished == self.workers and self.stats["loaded"] == len(self.indices)
+            if done and self.done_func is not None:
+                self.done_func(self.thumbnails)
+
+    def _load(self, slots):
+        try:
+            reader = self.open_func()
+        except Pyvidplayer2Error:
+            with self._lock:
+                self.stats["failed"] += len(slots)
+            return
+
+        try:
+            for slot in slots:
+                if self._stop:
+                    break
+                data = self._read(reader, self.indices[slot], slot == len(self.indices) - 1)
+                if data is None:
+                    with self._lock:
+                        self.stats["failed"] += 1
+                    continue
+                self.thumbnails[slot] = self.load_func(data)
+                with self._lock:
+                    self.stats["loaded"] += 1
+        finally:
+            reader.release()
+
+    def start(self):
+        for i in range(self.workers):
+            # each worker's slots are in ascending order, so its reader can read forward between them
+            slots = sorted(range(i, len(self.indices), self.workers), key=lambda slot: self.indices[slot])
+            thread = Thread(target=self._threaded_load, args=(slots,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def is_loading(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    # waits for every thumbnail to be loaded
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def stop(self):
+        self._stop = True
+        self.join()
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, total=len(self.indices), loading=self.is_loading())
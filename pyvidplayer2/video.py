@@ -5,19 +5,26 @@
 # active challenge to make better refactors
 
 import importlib.util
-import json
+import math
 import os
 import subprocess
 from abc import abstractmethod
-from threading import Thread
-from typing import Callable, Tuple, Union
+from threading import Lock, Thread
+from typing import Callable, Iterator, Tuple, Union
 
 import numpy as np
 
-from . import get_ffmpeg_loglevel, get_ffmpeg_path, get_ffprobe_path
+from . import frame_index, get_ffmpeg_loglevel, get_ffmpeg_path
 from .error import (AudioStreamError, FFmpegNotFoundError, OpenCVError,
-                    Pyvidplayer2Error, VideoStreamError, YTDLPError)
+                    Pyvidplayer2Error, YTDLPError)
 from .ffmpeg_reader import FFMPEGReader
+from .ffmpeg_scaler import FFmpegScaler
+from .frame_cache import DiskFrameCache, FrameCache
+from .frame_queue import FrameQueue
+from .frame_store import FrameStore
+from .reverse_buffer import ReverseBuffer
+from .scrub_previewer import ScrubPreviewer
+from .video_reader import get_streams, probe
 
 CV = 0
 if importlib.util.find_spec("cv2") is not None:
@@ -40,6 +47,7 @@ SOUNDDEVICE = 0
 if importlib.util.find_spec("sounddevice") is not None:
     SOUNDDEVICE = 1
     from .psd_handler import PSDHandler
+    from .psd_mixer import PSDMixerHandler
 
 PYGAME = 0
 SUBS = 0
@@ -74,6 +82,12 @@ READER_OPENCV = 2
 READER_IMAGEIO = 3
 READER_DECORD = 4
 
+# ffmpeg scale flags, indexed by the interp attribute
+FFMPEG_INTERPS = ("neighbor", "bilinear", "bicubic", "area", "lanczos")
+
+# most ffmpeg scaler processes kept open by one video
+MAX_SCALERS = 4
+
 
 class Video:
     """Base class for video playback. Videos can be read from
@@ -87,7 +101,8 @@ class Video:
                  post_process, interp, use_pygame_audio, reverse,
                  no_audio, speed, youtube, max_res, as_bytes, audio_track, vfr,
                  pref_lang, audio_index, reader,
-                 cuda_device) -> None:
+                 cuda_device, persistent_audio, shared_audio,
+                 buffer_pool, decode_ahead) -> None:
 
         self._audio_path = path  # used for audio only when streaming
 
@@ -108,6 +123,10 @@ class Video:
         if self.cuda_device >= 0 and reader != READER_FFMPEG:
             raise Pyvidplayer2Error("Must use FFmpeg reader for cuda devices.")
 
+        self.buffer_pool = buffer_pool
+        if self.buffer_pool > 0 and reader != READER_FFMPEG:
+            raise Pyvidplayer2Error("Must use FFmpeg reader for buffer pools.")
+
         # determines correct video backend here
         reader = self._get_best_reader(youtube, as_bytes, reader)
         if youtube:
@@ -136,7 +155,7 @@ class Video:
                 raise FileNotFoundError(
                     f"[Errno 2] No such file or directory: '{self.path}'")
 
-            self._vid = reader(self.path, cuda_device=cuda_device) if reader == FFMPEGReader else reader(self.path)
+            self._vid = reader(self.path, cuda_device=cuda_device, buffer_pool=buffer_pool) if reader == FFMPEGReader else reader(self.path)
             self.name, self.ext = os.path.splitext(os.path.basename(self.path))
 
         if not self._vid.isOpened() and CV:
@@ -154,6 +173,7 @@ class Video:
         self.current_size = self.original_size
         self.aspect_ratio = self.original_size[0] / self.original_size[1]
         self.audio_channels = 0
+        self.audio_sample_rate = 0
         self.num_audio_tracks = 0
 
         self.chunk_size = 0 if chunk_size < 0 else chunk_size
@@ -169,6 +189,11 @@ class Video:
         self._buffered_chunk = None
         self._stop_loading = False
         self._processes = []
+        self._audio_process = None  # long-lived decoder used by persistent_audio
+        self._frame_queue = None  # background decoder used by decode_ahead
+        self._probe_thread = None  # used by probe(background=True)
+        self._scalers = {}  # (input size, output size, interp) -> ffmpeg scaler, used without opencv
+        self._scalers_lock = Lock()
         self.frame = 0
 
         self.frame_data = None
@@ -192,6 +217,9 @@ class Video:
         self.audio_track = audio_track
         self.vfr = vfr  # or self._test_vfr()
         self.audio_index = audio_index
+        self.persistent_audio = persistent_audio
+        self.shared_audio = shared_audio
+        self.decode_ahead = 0
 
         # select correct audio backend
         if self.use_pygame_audio:
@@ -206,7 +234,7 @@ class Video:
                     "Python-sounddevice is not installed. Install it via pip or use a different audio backend.")
 
             # self._audio = PyaudioHandler()
-            self._audio = PSDHandler()
+            self._audio = PSDMixerHandler() if self.shared_audio else PSDHandler()
 
             if self.audio_index is not None:
                 self._audio._set_device_index(self.audio_index)
@@ -222,21 +250,49 @@ class Video:
         self._preloaded = False
         self._update_time = 0.0  # for testing
 
-        self.timestamps = []
-        self.min_fr = self.max_fr = self.avg_fr = self.frame_rate
-        if self.vfr:
-            self.timestamps = self._get_all_pts()
-            self.min_fr, self.max_fr, self.avg_fr = self._get_vfrs(self.timestamps)
+        # timestamps are indexed in the background, playback uses the nominal frame rate until they're ready
+        self._timestamps = None
+        self._vfrs = (self.frame_rate,) * 3
+        self._pts_thread = None
 
-        self._preloaded_frames = []
-        if self.reverse:
-            self._preload_frames()
+        # index saved by an earlier build_index call, which already has every timestamp
+        self._frame_index = None
+        self._index_thread = None
+        self._set_frame_index(frame_index.load(self.path))
+
+        if self.vfr and self._timestamps is None:
+            self._pts_thread = Thread(target=self._threaded_index_pts, daemon=True)
+            self._pts_thread.start()
+
+        self._preloaded_frames = FrameStore()
+
+        # decoded frames revisited by seeking, see set_frame_cache and set_disk_cache
+        self._frame_cache = None
+        self._disk_cache = None
+        self._read_forward = 0
+        self._seek_pending = None  # frame the reader still has to seek to
+        self._scrub_reader = None  # decodes keyframes for previews while scrubbing
+        self._scrub_keyframe = None
+        self._scrub_previewer = ScrubPreviewer(self._read_preview)
+
+        # reversed videos are decoded a segment at a time, backward from the current frame
+        self._reverse_buffer = ReverseBuffer(lambda index: self._vid.seek(index), self._read_unpooled,
+                                             self._get_reverse_segment_start, self._set_reverse_end)
 
         self.set_interp(interp)
 
         if not self.no_audio:
             self.set_audio_track(self.audio_track)
 
+        if decode_ahead > 0:
+            self.set_decode_ahead(decode_ahead)
+
+        if self.reverse:
+            # otherwise playback would start by skipping the frames decoded while the audio is already running
+            # an estimated frame count is lowered if the video ends early, so this repeats from the real last frame
+            while self.frame_count > 0 and self._reverse_buffer.get(self.frame_count - 1) is None:
+                pass
+
         self.play()
 
     def __len__(self) -> int:
@@ -261,10 +317,7 @@ class Video:
         if isinstance(item, slice):
             raise TypeError("Slicing is not supported.")
 
-        if item >= self.frame_count or item < -self.frame_count:
-            raise IndexError("Index out of bounds.")
-        if item < 0:
-            item = self.frame_count + item
+        item = self._get_index(item)
 
         if not self._skipped_frame:
             self._skipped_frame_index = self.frame
@@ -278,21 +331,28 @@ class Video:
         self._skipped_frame = True
 
         data = None
+        processed = False
 
         if self.reverse:
-            try:
-                data = self._preloaded_frames[self.frame_count - self.frame - 1]
-            except IndexError:
-                pass
+            data = self._reverse_buffer.get(self.frame_count - self.frame - 1)
+        elif self._get_frame_queue_running():
+            has_frame, data, processed = self._frame_queue.get()
+            if has_frame and data is None:
+                # the worker only grabbed this frame because playback was behind, so it's read again
+                # and the worker restarts after it, from a fresh playback position
+                self._stop_frame_queue()
+                self._vid.seek(self.frame)
+                data = self._vid.read()[1]
+                self._frame_queue.start(self._vid.frame)
         else:
+            self._sync_reader()
             data = self._vid.read()[1]
 
         if data is not None:
             self.frame += 1
             self._skipped_frame_index += 1
-            if self.original_size != self.current_size:
-                data = self._resize_frame(data, self.current_size, self.interp, not CV)
-            data = self.post_func(data)
+            if not processed:
+                data = self._process_frame(data)
 
             return data
 
@@ -363,13 +423,13 @@ class Video:
 
         # calculates differences in frametime, except the first and last frames are ignored because
         # they can be anomalous
-        difs = [pts[i + 1] - pts[i] for i in range(1, len(pts) - 2)]
-        if not difs:
+        difs = np.diff(np.asarray(pts, np.float64)[1:-1])
+        if len(difs) == 0:
             return 0, 0, 0
 
-        min_fr = 1 / max(difs)
-        max_fr = 1 / min(difs)
-        avg_fr = len(difs) / sum(difs)
+        min_fr = 1 / difs.max()
+        max_fr = 1 / difs.min()
+        avg_fr = len(difs) / difs.sum()
 
         return min_fr, max_fr, avg_fr
 
@@ -378,30 +438,46 @@ class Video:
         Returns the presentation timestamps for each frame
         """
 
-        try:
-            command = [
-                get_ffprobe_path(),
-                "-i", "-" if self.as_bytes else self.path,
-                "-select_streams", "v:0",
-                "-show_entries", "packet=pts_time",
-                "-loglevel", get_ffmpeg_loglevel(),
-                "-print_format", "json"
-            ]
+        # the same ffprobe pass also finds keyframes, so the whole index is saved for later opens
+        # an index saved earlier would already have been loaded when the video was opened
+        index = frame_index.build(self.path, self.as_bytes)
+        frame_index.save(self.path, index)
+        return index.pts
 
-            with subprocess.Popen(
-                    command, stdin=subprocess.PIPE if self.as_bytes else None, stdout=subprocess.PIPE) as p:
-                info = json.loads(p.communicate(input=self.path if self.as_bytes else None)[0])
-        except FileNotFoundError as e:
-            raise FFmpegNotFoundError(
-                "Could not find FFprobe (should be bundled with FFmpeg). "
-                "Make sure FFprobe is installed and accessible via PATH.") from e
+    def _threaded_index_pts(self):
+        try:
+            pts = self._get_all_pts()
+        except FFmpegNotFoundError:
+            self._missing_ffmpeg = True
+            return
+        self._vfrs = self._get_vfrs(pts)
+        self._timestamps = pts
 
-        pts = sorted([float(dict_["pts_time"]) for dict_ in info["packets"]])
-        if pts:
-            offset = pts[0]
-            pts = [t - offset for t in pts]
+    def _threaded_build_index(self):
+        index = frame_index.build(self.path, self.as_bytes)
+        frame_index.save(self.path, index)
+        self._set_frame_index(index)
 
-        return pts
+    def _set_frame_index(self, index):
+        if index is None:
+            return
+        self._frame_index = index
+        self._vid.frame_index = index
+        if self.vfr and self._timestamps is None:
+            self._vfrs = self._get_vfrs(index.pts)
+            self._timestamps = index.pts
+
+    # timestamps to convert between frames and seconds when seeking, or None to use the nominal frame rate
+    def _get_seek_timestamps(self):
+        if self._timestamps is not None:
+            return self._timestamps
+        if self._frame_index is not None:
+            return self._frame_index.pts
+        return None
+
+    def _wait_for_timestamps(self):
+        if self._pts_thread is not None:
+            self._pts_thread.join()
 
     # mainly for testing purposes
     def _force_ffmpeg_reader(self):
@@ -409,17 +485,107 @@ class Video:
         Force switches reader to READER_FFMPEG
         """
         if not isinstance(self._vid, FFMPEGReader):
+            self._reverse_buffer.clear()
             new_reader = FFMPEGReader(self.path, False)
             new_reader.frame_count = self._vid.frame_count
             new_reader.frame_rate = self._vid.frame_rate
             new_reader.original_size = self._vid.original_size
             new_reader.duration = self._vid.duration
+            new_reader.probe_info = self._vid.probe_info
+            new_reader.frame_index = self._vid.frame_index
             new_reader.frame = self._vid.frame
             new_reader.seek(self._vid.frame)
 
             self.colour_format = new_reader._colour_format
             self._vid.release()
             self._vid = new_reader
+            self._update_reader_size()
+
+    # a second reader of the same kind, for workers that can't share the video's reader
+    def _open_reader(self):
+        if isinstance(self._vid, FFMPEGReader):
+            reader = FFMPEGReader(self.path, False, cuda_device=self.cuda_device)
+        else:
+            reader = type(self._vid)(self.path)
+        reader.frame_count = self._vid.frame_count
+        reader.frame_rate = self._vid.frame_rate
+        reader.original_size = self._vid.original_size
+        reader.duration = self._vid.duration
+        reader.probe_info = self._vid.probe_info
+        reader.frame_index = self._vid.frame_index
+        return reader
+
+    # decodes only the keyframe at or before a time, much quicker than an exact seek
+    # which also decodes every frame after the keyframe
+    # only uses the scrub reader, since playback carries on with the video's reader on the main thread
+    def _read_keyframe(self, time):
+        # the scrub reader is only opened for videos that already have an index
+        if self._scrub_reader is not None:
+            index = int(np.searchsorted(self._scrub_reader.frame_index.pts, time, side="right")) - 1
+            keyframe = self._scrub_reader.frame_index.get_keyframe(max(index, 0))
+            if keyframe == self._scrub_keyframe:
+                return None
+
+            self._scrub_reader.seek(keyframe)
+            has_frame, data = self._scrub_reader.read()
+            if not has_frame:
+                return None
+            self._scrub_keyframe = keyframe
+            return data
+
+        # without an index, ffmpeg finds the keyframe and skips decoding everything else
+        w, h = self.original_size
+        command = [
+            get_ffmpeg_path(),
+            "-skip_frame", "nokey",
+            # seeking lands on the keyframe before the time, which shouldn't be skipped to reach the time
+            *(["-noaccurate_seek", "-ss", self._convert_seconds(time)] if not self.as_bytes else []),
+            "-i", "-" if self.as_bytes else self.path,
+            # piped input can't be seeked, so the first keyframe after the time is used instead
+            *(["-ss", self._convert_seconds(time)] if self.as_bytes else []),
+            "-loglevel", get_ffmpeg_loglevel(),
+            "-map", "0:v:0",
+            "-frames:v", "1",
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24" if self.colour_format == "RGB" else "bgr24",
+            "-sn",
+            "-an",
+            "-"
+        ]
+
+        try:
+            with subprocess.Popen(command, stdin=subprocess.PIPE if self.as_bytes else None,
+                                  stdout=subprocess.PIPE) as p:
+                out = p.communicate(input=self.path if self.as_bytes else None)[0]
+        except FileNotFoundError as e:
+            raise FFmpegNotFoundError(
+                "Could not find FFmpeg. Make sure FFmpeg is installed and accessible via PATH.") from e
+
+        if len(out) != w * h * 3:
+            return None
+        return np.frombuffer(out, np.uint8).reshape((h, w, 3))
+
+    # runs on the scrub previewer's thread
+    def _read_preview(self, time):
+        data = self._read_keyframe(time)
+        return None if data is None else self._process_frame(data)
+
+    # starts decoding a keyframe near a time without changing the position, for previews while scrubbing
+    def _preview_keyframe(self, time):
+        # a reader of its own, so the playback position is left alone
+        if self._scrub_reader is None and self._frame_index is not None and not (IIO and isinstance(self._vid, IIOReader)):
+            self._scrub_reader = self._open_reader()
+        self._scrub_previewer.request(time)
+
+    # shows the latest decoded preview, if there's a new one
+    def _show_preview(self):
+        data = self._scrub_previewer.poll()
+        if data is None:
+            return False
+
+        self.frame_data = data
+        self.frame_surf = self._create_frame(data)
+        return True
 
     def _set_stream_url(self, path, max_res):
         config = {"quiet": True,
@@ -454,21 +620,97 @@ class Video:
 
         self._preloaded_frames.clear()
 
+        self._reverse_buffer.stop()
         self._vid.seek(0)
 
         has_frame = True
         while has_frame:
             has_frame, data = self._vid.read()
             if has_frame:
-                self._preloaded_frames.append(data)
+                # pooled buffers get overwritten by later reads
+                self._preloaded_frames.append(data.copy() if self._vid.buffer_pool else data)
 
         self._vid.seek(self.frame)
 
+    def _get_index(self, item):
+        if item >= self.frame_count or item < -self.frame_count:
+            raise IndexError("Index out of bounds.")
+        return self.frame_count + item if item < 0 else item
+
+    # decodes frames in ascending order without touching playback, the reader catches up on its next read
+    def _read_frames(self, indices, strict=True):
+        self._stop_frame_queue()
+        self._reverse_buffer.stop()
+
+        wanted = sorted(set(indices))
+        frames = dict(zip(wanted, self._vid.read_batch(wanted)))
+        if not self.reverse:
+            self._seek_pending = self.frame
+
+        if len(frames) < len(wanted):
+            if strict:
+                raise IndexError(f"Could not read frame {wanted[len(frames)]}.")
+            indices = [index for index in indices if index in frames]
+
+        # post-processing can change the shape or type of frames, e.g. rotating them
+        if not indices:
+            w, h = self.current_size
+            return np.empty((0, h, w, 3), np.uint8)
+        return np.stack([self._process_frame(frames[index]) for index in indices])
+
+    # seek_frame leaves the reader where it is, so it catches up before its next read
+    def _sync_reader(self):
+        if self._seek_pending is not None:
+            self._move_reader(self._seek_pending)
+            self._seek_pending = None
+
+    # frames a short way ahead are decoded forward, since seeking restarts from a keyframe
+    def _move_reader(self, index):
+        if not 0 <= index - self._vid.frame <= self._read_forward:
+            self._vid.seek(index)
+        while self._vid.frame < index and self._vid.grab():
+            pass
+
+    def _get_cached_frame(self, index):
+        data = None
+        if self._frame_cache is not None:
+            data = self._frame_cache.get(index)
+        if data is None and self._disk_cache is not None:
+            data = self._disk_cache.get(index)
+            if data is not None and self._frame_cache is not None:
+                self._frame_cache.put(index, data)
+        return data
+
+    def _cache_frame(self, index, data):
+        if self._frame_cache is not None:
+            self._frame_cache.put(index, data)
+        if self._disk_cache is not None:
+            self._disk_cache.put(index, data)
+
+    # pooled buffers get overwritten by later reads
+    def _read_unpooled(self):
+        has_frame, data = self._vid.read()
+        if has_frame and self._vid.buffer_pool:
+            data = data.copy()
+        return has_frame, data
+
+    # reverse segments start at the keyframe before a frame if the video is indexed, and are at most a second long
+    def _get_reverse_segment_start(self, index):
+        start = index - max(int(self.frame_rate), 1) + 1
+        if self._frame_index is not None:
+            start = max(start, self._frame_index.get_keyframe(index))
+        return max(start, 0)
+
+    # reversed playback starts from the last frame that actually decodes
+    def _set_reverse_end(self, frame_count):
+        self.frame_count = min(self.frame_count, frame_count)
+
     def _get_real_frame_count(self):
         """
         Returns an accurate frame count by reading every frame
         """
 
+        self._reverse_buffer.stop()
         self._vid.seek(0)
 
         counter = 0
@@ -514,6 +756,10 @@ class Video:
         """
         Returns True if video has no audio
         """
+        if not self.youtube:
+            return len(get_streams(self._get_probe_info(), "audio")) == 0
+
+        # streamed audio comes from a separate url, so try decoding a little of it instead
         command = [
             get_ffmpeg_path(),
             "-i", self._audio_path,
@@ -525,10 +771,8 @@ class Video:
         ]
 
         try:
-            with subprocess.Popen(command,
-                                  stdout=subprocess.PIPE,
-                                  stdin=subprocess.PIPE if self.as_bytes else None) as p:
-                audio = p.communicate(input=self.path if self.as_bytes else None)[0]
+            with subprocess.Popen(command, stdout=subprocess.PIPE) as p:
+                audio = p.communicate()[0]
 
         except FileNotFoundError:
             self._missing_ffmpeg = True
@@ -536,9 +780,146 @@ class Video:
 
         return audio == b''
 
+    def _get_probe_info(self):
+        """
+        Returns FFprobe's information on every stream, reusing the reader's probe if it ran one
+        """
+        if self._vid.probe_info is None:
+            self._vid.probe_info = probe(self.path, self.as_bytes)
+        return self._vid.probe_info
+
+    def _threaded_probe(self):
+        self._vid._probe(self.path, self.as_bytes, count_packets=True)
+        self.frame_count = self._vid.frame_count
+        self.frame_rate = self._vid.frame_rate
+        self.frame_delay = 1 / self.frame_rate
+        self.duration = self._vid.duration
+        self.original_size = self._vid.original_size
+        self.aspect_ratio = self.original_size[0] / self.original_size[1]
+
     def _get_num_channels_to_process(self):
         return min(self.audio_channels, self._audio.get_num_channels())
 
+    def _get_audio_format(self):
+        """
+        Returns the sample rate and number of channels that extracted audio will have
+        """
+
+        # some audio handlers need every video to use the same sample rate
+        sample_rate = self._audio.get_sample_rate()
+
+        if self.no_audio:
+            return sample_rate or 44100, 2  # anullsrc defaults
+
+        channels = self._get_num_channels_to_process()
+        if channels == 0:
+            # channel layout is unknown when streaming from youtube
+            channels = max(1, min(2, self._audio.get_num_channels()))
+
+        return sample_rate or self.audio_sample_rate or 44100, channels
+
+    def _get_atempo_filter(self):
+        # atempo only accepts values from 0.5 to 100
+        filter_ = f"atempo={max(0.5, self.speed)}"
+        if self.speed < 0.5:
+            filter_ += f",atempo={self.speed/0.5}"
+        return filter_
+
+    def _pcm_to_chunk(self, pcm, channels, returncode=0):
+        """
+        Wraps raw 16 bit pcm from ffmpeg into a (samples, channels) array without copying
+        """
+
+        # unlike a failed extraction, ffmpeg succeeding without any output just means
+        # there was no audio left, which shouldn't raise an error when loaded
+        if not pcm and returncode == 0:
+            return np.zeros((1, channels), np.int16)
+
+        # discards any partial sample left over from a killed process
+        count = len(pcm) // (2 * channels) * channels
+        return np.frombuffer(pcm, np.int16, count=count).reshape(-1, channels)
+
+    def _feed_audio_process(self, process):
+        # ffmpeg reads from stdin when playing from memory
+        try:
+            process.stdin.write(self.path)
+            process.stdin.close()
+        except (BrokenPipeError, OSError, ValueError):
+            pass  # process was ended before consuming everything
+
+    def _open_audio_process(self, s):
+        """
+        Starts a single ffmpeg process that decodes audio from s seconds until the end
+        of the file, emitting raw 16 bit pcm on stdout
+        """
+
+        sample_rate, channels = self._get_audio_format()
+
+        if self.no_audio:
+            command = [
+                get_ffmpeg_path(),
+                "-f", "lavfi",
+                "-i", "anullsrc",
+                "-t", self._convert_seconds(max(0, self.duration - s) / self.speed)
+            ]
+        else:
+            command = [
+                get_ffmpeg_path(),
+                "-i", self._audio_path,
+                "-ss", self._convert_seconds(s),
+                "-vn",
+                "-sn",
+                "-map", f"0:a:{self.audio_track}",
+                *(["-af", self._get_atempo_filter()] if self.speed != 1 else [])
+            ]
+
+        command += [
+            "-ac", str(channels),
+            "-ar", str(sample_rate),
+            "-f", "s16le",
+            "-loglevel", get_ffmpeg_loglevel(),
+            "-"
+        ]
+
+        p = subprocess.Popen(command, stdout=subprocess.PIPE, stdin=subprocess.PIPE if self.as_bytes else None)
+        if self.as_bytes:
+            Thread(target=self._feed_audio_process, args=(p,), daemon=True).start()
+
+        return p
+
+    def _threaded_stream_load(self, index):
+        """
+        Same as _threaded_load, but reads the next chunk from a persistent
+        process instead of spawning a new one for each chunk
+        """
+
+        i = index
+
+        self._chunks.append(None)
+
+        if self._audio_process is None:
+            s = (self._starting_time + (self._chunks_claimed - 1) * self.chunk_size) / self.speed
+            try:
+                self._audio_process = self._open_audio_process(s)
+            except FileNotFoundError:
+                self._missing_ffmpeg = True
+                return
+            self._processes.append(self._audio_process)
+
+        sample_rate, channels = self._get_audio_format()
+
+        # each chunk covers chunk_size seconds of the video, which is
+        # chunk_size / speed seconds of output audio
+        size = round(self.chunk_size / self.speed * sample_rate) * channels * 2
+
+        try:
+            pcm = self._audio_process.stdout.read(size)
+        except (ValueError, OSError):
+            return  # process was ended by a seek
+
+        returncode = self._audio_process.poll() if len(pcm) < size else 0
+        self._chunks[i - self._chunks_played - 1] = self._pcm_to_chunk(pcm, channels, returncode or 0)
+
     # I wrote this method a long time ago when I didn't have
     # much experience with concurrent programming
     # currently, it is not thread safe
@@ -556,6 +937,8 @@ class Video:
         s = (self._starting_time + (self._chunks_claimed - 1) * self.chunk_size) / (
             self.speed if not self.reverse else 1)
 
+        sample_rate, channels = self._get_audio_format()
+
         if self.no_audio:
             # generates silent audio
             # very important because audio-visual syncing is done by tracking played audio chunks
@@ -566,7 +949,9 @@ class Video:
                 "-i", "anullsrc",
                 # if chunk_size==5 and speed==2, 10 seconds of silent audio will be generated
                 "-t", self._convert_seconds(min(self.chunk_size, self.duration - s) / self.speed),
-                "-f", "wav",
+                "-ac", str(channels),
+                "-ar", str(sample_rate),
+                "-f", "s16le",
                 "-loglevel", get_ffmpeg_loglevel(),
                 "-"
             ]
@@ -584,8 +969,9 @@ class Video:
                 # sounddevice can get number of channels output device has, allowing
                 # ffmpeg to remix audio to match
 
-                "-ac", str(self._get_num_channels_to_process()),
-                "-f", "wav",
+                "-ac", str(channels),
+                "-ar", str(sample_rate),
+                "-f", "s16le",
                 "-loglevel", get_ffmpeg_loglevel(),
                 "-"
             ]
@@ -598,9 +984,7 @@ class Video:
             if self.reverse:
                 filters += ["-af", "areverse"]
             elif self.speed != 1:
-                filters += ["-af", f"atempo={max(0.5, self.speed)}"]
-                if self.speed < 0.5:
-                    filters[-1] += f",atempo={self.speed/0.5}"
+                filters += ["-af", self._get_atempo_filter()]
 
                 # rubberband is more intensive
                 # filters += ["-af", f"rubberband=tempo={self.speed}"]
@@ -617,14 +1001,15 @@ class Video:
             if not self.no_audio and self.speed != 1 and self.reverse:
                 command = [
                     get_ffmpeg_path(),
+                    "-f", "s16le",
+                    "-ac", str(channels),
+                    "-ar", str(sample_rate),
                     "-i", "-",
-                    "-af", f"atempo={max(0.5, self.speed)}",
-                    "-f", "wav",
+                    "-af", self._get_atempo_filter(),
+                    "-f", "s16le",
                     "-loglevel", get_ffmpeg_loglevel(),
                     "-"
                 ]
-                if self.speed < 0.5:
-                    command[4] += f",atempo={self.speed/0.5}"
 
                 process = subprocess.Popen(command, stdout=subprocess.PIPE, stdin=subprocess.PIPE)
                 self._processes.append(process)
@@ -638,7 +1023,7 @@ class Video:
         # print(subprocess.list2cmdline(command))
 
         self._processes.remove(p)
-        self._chunks[i - self._chunks_played - 1] = audio
+        self._chunks[i - self._chunks_played - 1] = self._pcm_to_chunk(audio, channels, p.returncode)
 
     def _update_threads(self):
         # forcing this to be 1 because it's both obsolete and not thread safe
@@ -653,7 +1038,9 @@ class Video:
         if not self._stop_loading and (len(self._threads) < self.max_threads) and (
                 (self._chunks_len(self._chunks) + len(self._threads)) < self.max_chunks):
             self._chunks_claimed += 1
-            self._threads.append(Thread(target=self._threaded_load,
+            # areverse needs the entire chunk at once, so it can't be streamed
+            streaming = self.persistent_audio and not self.reverse
+            self._threads.append(Thread(target=self._threaded_stream_load if streaming else self._threaded_load,
                                         args=(self._chunks_claimed,)))
             self._threads[-1].start()
 
@@ -669,28 +1056,23 @@ class Video:
             else:
                 sub._write_subs(self.frame_surf)
 
+    # index of the last timestamp at or before ts, or the first one if ts comes before all of them
     def _get_closest_frame(self, pts, ts):
-        low, high = 0, len(pts) - 1
-        index = low
-        while low <= high:
-            mid = low + (high - low) // 2
-            if pts[mid] < ts:
-                low = mid + 1
-            elif pts[mid] > ts:
-                high = mid - 1
-            else:
-                index = mid
-                break
-            if abs(pts[mid] - ts) < abs(pts[index] - ts):
-                index = mid
-        if pts[index] > ts and index > 0:
-            index -= 1
-        return index
-
-    def _has_frame(self, p):
-        if self.vfr:
-            return self.frame < self.frame_count and p > self.timestamps[self.frame]
-        return p > self.frame / float(self.frame_rate)
+        return max(int(np.searchsorted(pts, ts, side="right")) - 1, 0)
+
+    # number of frames, starting from the current one, whose time has come at playback position p
+    def _get_frames_due(self, p):
+        if self._timestamps is not None:
+            due = min(int(np.searchsorted(self._timestamps, p, side="left")), self.frame_count)
+        else:
+            # frames where p > frame / frame_rate, corrected for rounding in the multiplication
+            rate = float(self.frame_rate)
+            due = max(math.ceil(p * rate), 0)
+            if due > 0 and not p > (due - 1) / rate:
+                due -= 1
+            elif p > due / rate:
+                due += 1
+        return max(due - self.frame, 0)
 
     # driving function behind video playback
     def _update(self):
@@ -711,14 +1093,21 @@ class Video:
             p = self.get_pos()
             self._update_time = p
 
-            while self._has_frame(p):
+            queued = self._get_frame_queue_running()
+            if queued:
+                self._frame_queue.pos = p
+
+            due = self._get_frames_due(p)
+            while due > 0:
+                due -= 1
                 data = None
+                processed = False
                 if self.reverse:
+                    # skipped frames don't need their segment decoded
                     has_frame = True
-                    try:
-                        data = self._preloaded_frames[self.frame_count - self.frame - 1]
-                    except IndexError:
-                        has_frame = False
+                    if due == 0:
+                        data = self._reverse_buffer.get(self.frame_count - self.frame - 1)
+                        has_frame = data is not None
                 else:
                     self.buffering = True
                     if self._preloaded:
@@ -727,7 +1116,17 @@ class Video:
                             data = self._preloaded_frames[self.frame]
                         except IndexError:
                             has_frame = False
+                    elif queued:
+                        item = self._frame_queue.pop()
+                        if item is None:
+                            break  # next frame is still being decoded, stays buffering
+                        has_frame, data, processed = item
+                    elif due > 0:
+                        # frame will be skipped below, so it doesn't need to be converted
+                        self._sync_reader()
+                        has_frame = self._vid.grab()
                     else:
+                        self._sync_reader()
                         has_frame, data = self._vid.read()
                     self.buffering = False
 
@@ -735,13 +1134,12 @@ class Video:
 
                 # optimized for high playback speeds by
                 # avoiding redundant calculations for skipped frames
-                if self._has_frame(p):
+                if due > 0 or (has_frame and data is None):
                     continue
 
                 if has_frame:
-                    if self.original_size != self.current_size:
-                        data = self._resize_frame(data, self.current_size, self.interp, not CV)
-                    data = self.post_func(data)
+                    if not processed:
+                        data = self._process_frame(data)
 
                     self.frame_data = data
                     self.frame_surf = self._create_frame(data)
@@ -759,7 +1157,7 @@ class Video:
                 tmp = self._chunks.pop(0)
                 if self._chunks_played == 1 and self._buffer_first_chunk and self._buffered_chunk is None:
                     self._buffered_chunk = tmp
-                self._audio.load(tmp)
+                self._audio.load(tmp, self._get_audio_format()[0])
                 self._audio.play()
             elif self._stop_loading and self._chunks_played == self._chunks_claimed:
                 self.stop()
@@ -768,6 +1166,55 @@ class Video:
 
         return n
 
+    def _process_frame(self, data):
+        # frames from the ffmpeg reader may already be scaled
+        if (data.shape[1], data.shape[0]) != tuple(self.current_size):
+            data = self._resize_frame(data, self.current_size, self.interp, not CV)
+        return self.post_func(data)
+
+    # lets ffmpeg scale frames while decoding instead of resizing every frame afterwards
+    def _update_reader_size(self):
+        if isinstance(self._vid, FFMPEGReader):
+            self._vid.set_output_size(self.current_size, FFMPEG_INTERPS[self.interp])
+
+    def _get_frame_time(self, index):
+        if self._timestamps is not None and index < len(self._timestamps):
+            return self._timestamps[index]
+        return index / self.frame_rate
+
+    def _get_frame_queue_running(self):
+        return self._frame_queue is not None and self._frame_queue.get_running()
+
+    def _stop_frame_queue(self):
+        if self._frame_queue is not None:
+            self._frame_queue.stop()
+
+    def _start_frame_queue(self):
+        # reversed videos have their own worker, and preloaded videos already have every frame in memory
+        if self._frame_queue is None or self.reverse or self._preloaded or self.closed:
+            return
+
+        # the worker may have read ahead of the frame that is actually next
+        self._sync_reader()
+        if self._vid.frame != self.frame:
+            self._vid.seek(self.frame)
+        self._frame_queue.start(self.frame)
+
+    # called when the size, interpolation or post-processing changes
+    # queued frames were processed with the old settings, and the reader may need to scale differently
+    def _apply_frame_settings(self):
+        queued = self._get_frame_queue_running()
+        self._stop_frame_queue()
+        # cached frames are at the old size
+        self._reverse_buffer.clear()
+        if self._frame_cache is not None:
+            self._frame_cache.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+        self._update_reader_size()
+        if queued:
+            self._start_frame_queue()
+
     # interp parameter only used for ffmpeg resampling
 
     def _resize_frame(self, data: np.ndarray, size: Tuple[int, int], interp, use_ffmpeg=False):
@@ -781,45 +1228,65 @@ class Video:
             return cv2.resize(data, dsize=size, interpolation=interp)
 
         # without opencv, use ffmpeg resizing
+        # one process is kept open per geometry instead of starting one for every frame
 
         if isinstance(interp, int):
-            interp = ("neighbor", "bilinear", "bicubic", "area", "lanczos")[interp]
+            interp = FFMPEG_INTERPS[interp]
 
+        scaler = self._get_scaler((data.shape[1], data.shape[0]), tuple(size), interp)
         try:
-            with subprocess.Popen(
-                    [
-                        get_ffmpeg_path(),
-                        "-loglevel", get_ffmpeg_loglevel(),
-                        "-f", "rawvideo",
-                        "-pix_fmt", "rgb24",
-                        "-s", f"{data.shape[1]}x{data.shape[0]}",
-                        "-i", "-",
-                        "-vf", f"scale={size[0]}:{size[1]}:flags={interp}",
-                        "-f", "rawvideo",
-                        "-"
-                    ],
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-            ) as p:
-                return np.frombuffer(p.communicate(input=data.tobytes())[0], np.uint8).reshape((size[1], size[0], 3))
-        except FileNotFoundError as e:
-            raise FFmpegNotFoundError(
-                "Could not find FFmpeg. Make sure it's downloaded and accessible via PATH.") from e
-
-    def probe(self) -> None:
+            return scaler.scale(data)
+        finally:
+            scaler.lock.release()
+
+    # returns the scaler with its lock held, taken before the cache lock is released
+    # so another thread evicting it has to wait until this frame is scaled
+    def _get_scaler(self, in_size, out_size, interp):
+        key = (in_size, out_size, interp)
+        with self._scalers_lock:
+            if key not in self._scalers:
+                # old geometries are rarely used again after resizing
+                if len(self._scalers) >= MAX_SCALERS:
+                    self._scalers.pop(next(iter(self._scalers))).close()
+                self._scalers[key] = FFmpegScaler(in_size, out_size, interp)
+            scaler = self._scalers[key]
+            scaler.lock.acquire()
+        return scaler
+
+    def _close_scalers(self):
+        with self._scalers_lock:
+            for scaler in self._scalers.values():
+                scaler.close()
+            self._scalers.clear()
+
+    def probe(self, background: bool = False) -> None:
         """Use FFprobe to find information about the video. When using OpenCV
         to read videos, information such as frame count and frame rate are
         read through the file headers, which is sometimes incorrect.
         For more accuracy, call this method to start a probe and update video
-        metadata attributes."""
+        metadata attributes. Frame count falls back on counting every packet
+        in the file, which can take a few seconds for large files, so set
+        background to True to update the attributes once it finishes instead."""
 
-        self._vid._probe(self.path, self.as_bytes)
-        self.frame_count = self._vid.frame_count
-        self.frame_rate = self._vid.frame_rate
-        self.frame_delay = 1 / self.frame_rate
-        self.duration = self._vid.duration
-        self.original_size = self._vid.original_size
-        self.aspect_ratio = self.original_size[0] / self.original_size[1]
+        if background:
+            self._probe_thread = Thread(target=self._threaded_probe, daemon=True)
+            self._probe_thread.start()
+        else:
+            self._threaded_probe()
+
+    def build_index(self, background: bool = False) -> None:
+        """Record the timestamp of every frame and which frames are keyframes,
+        so seeking lands on exact frames instead of estimating positions from
+        the frame rate. This reads the whole file without decoding it. If a
+        cache directory is set, the index is saved there and loaded again
+        the next time the file is opened. Set background to True to build the
+        index in a separate thread."""
+
+        if background:
+            self._index_thread = Thread(target=self._threaded_build_index, daemon=True)
+            self._index_thread.start()
+        else:
+            self._threaded_build_index()
 
     def update(self) -> bool:
         """Allow video to perform required calculations. Draw automatically
@@ -832,6 +1299,28 @@ class Video:
     def volume(self):
         return self.get_volume()
 
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Presentation timestamps of every frame, only extracted in vfr mode.
+        Waits for the background index to finish if it hasn't already."""
+        self._wait_for_timestamps()
+        return np.empty(0, np.float64) if self._timestamps is None else self._timestamps
+
+    @property
+    def min_fr(self) -> float:
+        self._wait_for_timestamps()
+        return self._vfrs[0]
+
+    @property
+    def max_fr(self) -> float:
+        self._wait_for_timestamps()
+        return self._vfrs[1]
+
+    @property
+    def avg_fr(self) -> float:
+        self._wait_for_timestamps()
+        return self._vfrs[2]
+
     def set_interp(self, interp: Union[str, int]) -> None:
         """Set the interpolation technique for frame resizing. Accepts nearest,
          linear, cubic, lanczos4, area. Nearest is the fastest technique but
@@ -853,11 +1342,115 @@ class Video:
         else:
             raise ValueError("Interpolation technique not recognized.")
 
+        self._apply_frame_settings()
+
     def set_post_func(self, func: Callable[[np.ndarray], np.ndarray]) -> None:
         """Change the post-processing function. Works the same as the
         post_func parameter."""
 
         self.post_func = func
+        self._apply_frame_settings()
+
+    def set_decode_ahead(self, depth: int, drop_policy: str = "late") -> None:
+        """Decode, resize and post-process up to depth frames ahead of
+        playback on a background thread, so that drawing only has to pick up
+        finished frames. With the late drop policy, frames that are already
+        behind the audio clock and would be skipped anyway are not resized or
+        post-processed. With the none drop policy, every frame is processed.
+        A depth of 0 turns decode-ahead off. Has no effect on reversed
+        videos, which are decoded in segments instead."""
+
+        self._stop_frame_queue()
+        self._reverse_buffer.stop()
+
+        if depth <= 0:
+            self._frame_queue = None
+            self.decode_ahead = 0
+            self._sync_reader()
+            if self._vid.frame != self.frame:
+                self._vid.seek(self.frame)
+            return
+
+        # queued frames and the displayed frame all hold on to pooled buffers
+        if self._vid.buffer_pool and self._vid.buffer_pool < depth + 2:
+            self._vid.buffer_pool = depth + 2
+            self._vid._buffers = []
+
+        self._frame_queue = FrameQueue(self._vid.read, self._vid.grab, self._process_frame, self._get_frame_time, depth,
+                                       drop_policy)
+        self.decode_ahead = self._frame_queue.depth
+        self._start_frame_queue()
+
+    def set_frame_store(self, storage: str = "raw", scale: float = 1.0, cache_mb: float = 64.0,
+                        quality: int = 90) -> None:
+        """Choose how preloaded frames are kept. Raw keeps every decoded
+        frame as is. Jpg and png compress frames with OpenCV, and memmap
+        writes them to a temporary file that the operating system can page
+        out. Scale downscales stored frames, which are resized back when
+        shown. Frames that aren't raw are decoded again when used, with the
+        most recent ones kept in memory up to cache_mb megabytes. Quality
+        only applies to jpg. Frames that are already preloaded are moved to
+        the new store."""
+
+        store = FrameStore(storage, scale, cache_mb, quality)
+        for data in self._preloaded_frames:
+            store.append(data)
+        self._preloaded_frames.clear()
+        self._preloaded_frames = store
+
+    def get_frame_store_stats(self) -> dict:
+        """Return a dictionary describing the preloaded frame store: how
+        many frames it holds, bytes used by stored and decoded frames, and
+        decoded frame cache hits and misses."""
+
+        return self._preloaded_frames.get_stats()
+
+    def set_frame_cache(self, size_mb: float, read_forward: int = 0) -> None:
+        """Keep frames decoded by seeking in memory, up to size_mb megabytes,
+        so seeking back to them, including through indexing, doesn't decode
+        them again. The least recently used frames are dropped first. A size
+        of 0 turns the cache off. Seeking to the frame right after the last
+        one read, like video[i + 1] after video[i], always reads forward
+        instead of seeking. Read_forward extends this to frames up to that
+        many frames ahead, which are decoded and skipped instead of seeking
+        back to a keyframe."""
+
+        self._sync_reader()
+        self._frame_cache = FrameCache(size_mb) if size_mb > 0 else None
+        self._read_forward = max(0, read_forward)
+
+    def get_frame_cache_stats(self) -> dict:
+        """Return a dictionary of frame cache statistics: hits, misses,
+        evicted, frames, bytes and max_bytes. Empty if the cache is off."""
+
+        return {} if self._frame_cache is None else self._frame_cache.get_stats()
+
+    def set_disk_cache(self, size_mb: float, directory: str = None) -> None:
+        """Keep frames decoded by seeking in a memory-mapped temporary file
+        of up to size_mb megabytes, so seeking back to them, including
+        through indexing, doesn't decode them again. The least recently used
+        frames are replaced once the file is full. Directory defaults to the
+        system's temporary directory. A size of 0 turns the cache off."""
+
+        self._sync_reader()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+        self._disk_cache = DiskFrameCache(size_mb, directory) if size_mb > 0 else None
+
+    def get_disk_cache_stats(self) -> dict:
+        """Return a dictionary of disk cache statistics: hits, misses,
+        evicted, frames, max_frames and max_bytes. Empty if the cache is off."""
+
+        return {} if self._disk_cache is None else self._disk_cache.get_stats()
+
+    def get_decode_stats(self) -> dict:
+        """Return a dictionary of decode-ahead statistics. Decoded and dropped
+        count frames read by the background thread and frames it skipped
+        processing for. Popped counts frames handed to playback, and underruns
+        counts how many times playback had to wait for a frame. Returns an
+        empty dictionary if decode-ahead is off."""
+
+        return {} if self._frame_queue is None else self._frame_queue.get_stats()
 
     def get_metadata(self):
         """Output a dictionary with attributes about the file metadata,
@@ -935,6 +1528,8 @@ class Video:
         current frame."""
 
         self.current_size = size
+        self._apply_frame_settings()
+
         if self.frame_data is not None:
             self.frame_data = self._resize_frame(self.frame_data, self.current_size, self.interp, not CV)
             self.frame_surf = self._create_frame(self.frame_data)
@@ -956,10 +1551,20 @@ class Video:
         unexpected behaviour."""
 
         if not self.closed:
+            self._scrub_previewer.stop()
             self._preloaded_frames.clear()
+            self._reverse_buffer.clear()
+            if self._frame_cache is not None:
+                self._frame_cache.clear()
+            if self._disk_cache is not None:
+                self._disk_cache.clear()
             self.path = ""  # clears byte buffer
             self.stop()
+            self._stop_frame_queue()
+            self._close_scalers()
             self._vid.release()
+            if self._scrub_reader is not None:
+                self._scrub_reader.release()
             self._audio.close()
             self.closed = True
 
@@ -1016,34 +1621,13 @@ class Video:
         if self.youtube:
             return
 
-        try:
-            command = [
-                get_ffprobe_path(),
-                "-i", "-" if self.as_bytes else self.path,
-                "-show_streams",
-                "-select_streams", "a",
-                "-loglevel", get_ffmpeg_loglevel(),
-                "-print_format", "json"
-            ]
-
-            with subprocess.Popen(
-                    command,
-                    stdin=subprocess.PIPE if self.as_bytes else None,
-                    stdout=subprocess.PIPE) as p:
-                info = json.loads(p.communicate(input=self.path if self.as_bytes else None)[0])
-        except FileNotFoundError as e:
-            raise FFmpegNotFoundError(
-                "Could not find FFprobe (should be bundled with FFmpeg). "
-                "Make sure FFprobe is installed and accessible via PATH.") from e
-
-        if len(info) == 0:
-            raise VideoStreamError("Could not determine video.")
-        info = info["streams"]
+        info = get_streams(self._get_probe_info(), "audio")
 
         if index < 0 or index > len(info) - 1:
             raise AudioStreamError(f"Audio index {index} out of range.")
 
         self.audio_channels = info[index]["channels"]
+        self.audio_sample_rate = int(info[index].get("sample_rate", 0))
         self.num_audio_tracks = len(info)
         self.audio_track = index
         self.seek(self.get_pos(), relative=False, intuitive=False)  # reloads current audio chunks
@@ -1084,11 +1668,16 @@ class Video:
         self._starting_time = round(self._starting_time, 3)
         self._starting_time = min(max(0, self._starting_time), self.duration)
 
+        self._stop_frame_queue()
+        self._reverse_buffer.stop()
+
         for p in self._processes:
             # borrow method to cleanly close processes
             FFMPEGReader._end_proc(p)
         for t in self._threads:
             t.join()
+        self._processes.clear()
+        self._audio_process = None
 
         self._chunks.clear()
         self._threads.clear()
@@ -1099,8 +1688,9 @@ class Video:
         self.frame_data = None
         self.frame_surf = None
 
-        if self.vfr:
-            frame = self._get_closest_frame(self.timestamps, self._starting_time)
+        pts = self._get_seek_timestamps()
+        if pts is not None:
+            frame = self._get_closest_frame(pts, self._starting_time)
         else:
             frame = int(self._starting_time * self.frame_rate)
             if frame >= self.frame_count:
@@ -1108,6 +1698,7 @@ class Video:
         if intuitive and not relative:
             frame += 1
         self._vid.seek(frame)
+        self._seek_pending = None
 
         self.frame = self._vid.frame
 
@@ -1115,6 +1706,7 @@ class Video:
             sub._seek(self._starting_time)
 
         self.buffer_current()
+        self._start_frame_queue()
 
     def seek_frame(self, index: int, relative: bool = False, intuitive: bool = True) -> None:
         """Seek to a specific frame. Index 0 will seek to the first frame, 1 to
@@ -1129,16 +1721,22 @@ class Video:
         index = (self.frame + index) if relative else index
         index = min(max(index, 0), self.frame_count - 1)
 
-        if self.vfr:
-            self._starting_time = self.timestamps[index]
+        pts = self._get_seek_timestamps()
+        if pts is not None and index < len(pts):
+            self._starting_time = pts[index]
         else:
             self._starting_time = min(max(0, index / self.frame_rate), self.duration)
 
+        self._stop_frame_queue()
+        self._reverse_buffer.stop()
+
         for p in self._processes:
             # borrow method to cleanly close processes
             FFMPEGReader._end_proc(p)
         for t in self._threads:
             t.join()
+        self._processes.clear()
+        self._audio_process = None
 
         self._chunks.clear()
         self._threads.clear()
@@ -1158,7 +1756,13 @@ class Video:
         if intuitive and not relative:
             index += 1
 
-        self._vid.seek(index)
+        # buffer_current reads the frame before, which leaves the reader here anyway,
+        # and doesn't touch the reader at all if that frame is cached
+        if self.reverse:
+            self._vid.seek(index)
+            self._seek_pending = None
+        else:
+            self._seek_pending = index
 
         self.frame = index
 
@@ -1166,6 +1770,46 @@ class Video:
             sub._seek(self._starting_time)
 
         self.buffer_current()
+        self._start_frame_queue()
+
+    def get_frames(self, indices) -> np.ndarray:
+        """Return the frames at the given indices stacked in a single array
+        of shape (n, height, width, 3), in the order given. Frames are decoded
+        in ascending order, reading forward between nearby frames instead of
+        seeking, and are resized and post-processed like displayed frames, so
+        post-processing that rotates frames changes the shape as well.
+        Unlike indexing, this doesn't change the current frame or reload
+        audio. Negative indices count from the end."""
+
+        indices = [self._get_index(index) for index in indices]
+
+        queued = self._get_frame_queue_running()
+        batch = self._read_frames(indices)
+        if queued:
+            self._start_frame_queue()
+        return batch
+
+    def iter_batches(self, batch_size: int, step: int = 1, start: int = 0, end: int = None) -> Iterator[np.ndarray]:
+        """Yield every step-th frame from start up to end in stacked arrays
+        of up to batch_size frames, decoded the same way as get_frames. End
+        defaults to the last frame. Stops early if the video ends before the
+        estimated frame count."""
+
+        end = self.frame_count if end is None else min(end, self.frame_count)
+        span = max(1, batch_size) * step
+
+        queued = self._get_frame_queue_running()
+        try:
+            for i in range(start, end, span):
+                indices = range(i, min(i + span, end), step)
+                batch = self._read_frames(indices, strict=False)
+                if len(batch):
+                    yield batch
+                if len(batch) < len(indices):
+                    break
+        finally:
+            if queued:
+                self._start_frame_queue()
 
     def buffer_current(self) -> bool:
         """Populate frame_data and frame_surf if they are currently None.
@@ -1181,18 +1825,35 @@ class Video:
         if self.reverse:
             # at least one frame was rendered already - there's something to buffer
             if self.frame > 0:
-                has_frame = True
-                data = self._preloaded_frames[self.frame_count - self.frame]
+                data = self._reverse_buffer.get(self.frame_count - self.frame)
+                has_frame = data is not None
 
-        # same check here
-        elif self._vid.frame > 0:
-            self._vid.seek(self._vid.frame - 1)
-            has_frame, data = self._vid.read()
+        else:
+            # the decode-ahead worker reads past the current frame
+            queued = self._get_frame_queue_running()
+            if queued:
+                self._stop_frame_queue()
+                self._vid.seek(self.frame)
+                self._seek_pending = None
+
+            # same check here
+            index = (self._vid.frame if self._seek_pending is None else self._seek_pending) - 1
+            if index >= 0:
+                data = self._get_cached_frame(index)
+                has_frame = data is not None
+                if not has_frame:
+                    # reading the frame before leaves the reader where it was meant to be
+                    self._seek_pending = None
+                    self._move_reader(index)
+                    has_frame, data = self._vid.read()
+                    if has_frame:
+                        self._cache_frame(index, data)
+
+            if queued:
+                self._start_frame_queue()
 
         if has_frame:
-            if self.original_size != self.current_size:
-                data = self._resize_frame(data, self.current_size, self.interp, not CV)
-            data = self.post_func(data)
+            data = self._process_frame(data)
 
             self.frame_data = data
             self.frame_surf = self._create_frame(data)
@@ -1205,6 +1866,22 @@ class Video:
 
         return False
 
+    # loads the first audio chunk and shows the first frame before playback starts
+    # used to open the next video in a queue while the current one is still playing
+    def _prebuffer(self):
+        self._update_threads()
+        for t in self._threads:
+            t.join()
+
+        if self.frame_data is None and not self.reverse and not self._preloaded:
+            has_frame, data = self._vid.read()
+            if has_frame:
+                data = self._process_frame(data)
+                self.frame_data = data
+                self.frame_surf = self._create_frame(data)
+            # the first frame is read again once playback starts
+            self._vid.seek(0)
+
     # type hints declared by inherited subclasses
 
     def draw(self, surf, pos, force_draw):
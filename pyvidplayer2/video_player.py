@@ -1,12 +1,17 @@
 import math
+from threading import Thread
 from typing import List, Tuple, Union
 
 import pygame
 
-from . import Video
+from . import Video, thumbnail_cache
 from .error import VideoStreamError
+from .thumbnail_loader import ThumbnailLoader
 from .video_pygame import VideoPygame
 
+THUMBNAIL_WORKERS = 2  # readers decoding preview thumbnails at once
+PREFETCH_TIME = 5  # seconds before the end of a video to start opening the next path in the queue
+
 
 class VideoPlayer:
     """VideoPlayers are GUI containers for videos. They are useful for scaling
@@ -55,10 +60,19 @@ class VideoPlayer:
         self._seek_pos = 0
         self._seek_time = 0
         self._show_seek = False
+        self._scrubbing = False  # dragging along the progress bar
+        self._scrub_time = None  # time of the last keyframe preview
+        self._scrub_paused = False  # whether the video was paused before dragging
 
         self._fade_timer = 0
         self._buffer_timer = 0
 
+        self._prefetch_thread = None  # opens the next queued path before the current video ends
+        self._prefetched = None  # (path, video or the error raised opening it)
+
+        self._thumbnail_loader = None  # decodes preview thumbnails in the background
+        self._thumbnail_size = (int(70 * self.video.aspect_ratio), 70)
+
         if self._show_intervals:
             self._interval = self.video.duration / self.preview_thumbnails
             self._interval_frames = []
@@ -85,46 +99,88 @@ class VideoPlayer:
             except AttributeError:
                 pass
 
-    def _get_interval_frames(self):
-        size = (int(70 * self.video.aspect_ratio), 70)
-
-        self._interval_frames.clear()
-        frame = self.video._vid.frame
-
-        for i in range(self.preview_thumbnails):
-            if self.video._preloaded:
-                data = self.video._preloaded_frames[int(i * self.video.frame_rate * self._interval)]
-            else:
-                self.video._vid.seek(int(i * self.video.frame_rate * self._interval))
-                data = self.video._vid.read()[1]
+    def _threaded_prefetch(self, path):
+        try:
+            video = Video(path)
+            video._prebuffer()
+        except Exception as e:  # raised once the video is needed, like it would have been without prefetching
+            self._prefetched = (path, e)
+        else:
+            self._prefetched = (path, video)
+
+    def _prefetch_next(self):
+        if self._prefetch_thread is not None or not self.queue_ or not isinstance(self.queue_[0], str):
+            return
+        if self.video.duration - self.video.get_pos() > PREFETCH_TIME:
+            return
+        self._prefetch_thread = Thread(target=self._threaded_prefetch, args=(self.queue_[0],), daemon=True)
+        self._prefetch_thread.start()
+
+    # returns None if the path wasn't prefetched
+    def _take_prefetched(self, path):
+        if self._prefetch_thread is None:
+            return None
+        # usually finished long ago, unless the video was skipped
+        self._prefetch_thread.join()
+        self._prefetch_thread = None
+        prefetched_path, result = self._prefetched
+        self._prefetched = None
+
+        if prefetched_path != path:
+            if isinstance(result, Video):
+                result.close()
+            return None
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _discard_prefetched(self):
+        if self._prefetch_thread is not None:
+            self._take_prefetched(None)
+
+    def _create_thumbnail(self, data):
+        return pygame.image.frombuffer(
+            self.video._resize_frame(data, self._thumbnail_size, "fast_bilinear", True).tobytes(),
+            self._thumbnail_size, self.video._vid._colour_format)
 
-            self._interval_frames.append(
-                pygame.image.frombuffer(self.video._resize_frame(data, size, "fast_bilinear", True).tobytes(), size,
-                                        self.video._vid._colour_format))
+    def _get_interval_frames(self):
+        # saved by an earlier player for the same file
+        self._interval_frames = thumbnail_cache.load(self.video.path, self.preview_thumbnails, self._thumbnail_size)
+        if self._interval_frames is not None:
+            return
 
-        # add last readable frame
+        indices = [int(i * self.video.frame_rate * self._interval) for i in range(self.preview_thumbnails)]
 
         if self.video._preloaded:
-            self._interval_frames.append(pygame.image.frombuffer(
-                self.video._resize_frame(self.video._preloaded_frames[-1], size, "fast_bilinear", True).tobytes(), size,
-                self.video._vid._colour_format))
+            # already decoded, so there's nothing to wait for
+            self._interval_frames = [self._create_thumbnail(self.video._preloaded_frames[i]) for i in indices]
+            # add last readable frame
+            self._interval_frames.append(self._create_thumbnail(self.video._preloaded_frames[-1]))
         else:
-            i = 1
-            while True:
-                self.video._vid.seek(self.video.frame_count - i)
-                try:
-                    self._interval_frames.append(pygame.image.frombuffer(
-                        self.video._resize_frame(self.video._vid.read()[1], size, "fast_bilinear", True).tobytes(),
-                        size, self.video._vid._colour_format))
-                except AttributeError:
-                    i += 1
-                else:
-                    break
-
-            self.video._vid.seek(frame)
-
+            # decoded in the background with separate readers, so the video's reader is left alone
+            indices.append(self.video.frame_count - 1)
+            self._thumbnail_loader = ThumbnailLoader(
+                self.video._open_reader, self._create_thumbnail, indices, THUMBNAIL_WORKERS,
+                lambda thumbnails, path=self.video.path: thumbnail_cache.save(
+                    path, self.preview_thumbnails, self._thumbnail_size, thumbnails))
+            self._interval_frames = self._thumbnail_loader.thumbnails
+            self._thumbnail_loader.start()
+
+    def _stop_thumbnails(self):
+        if self._thumbnail_loader is not None:
+            self._thumbnail_loader.stop()
+
+    # returns None if no thumbnails have loaded yet
     def _get_closest_frame(self, time):
-        return self._interval_frames[round(time / self._interval)]
+        index = round(time / self._interval)
+        if self._interval_frames[index] is not None:
+            return self._interval_frames[index]
+
+        # stand in with the closest thumbnail that has loaded
+        loaded = [i for i, surf in enumerate(self._interval_frames) if surf is not None]
+        if not loaded:
+            return None
+        return self._interval_frames[min(loaded, key=lambda i: abs(i - index))]
 
     def _transform(self, rect):
         self.frame_rect = rect
@@ -165,6 +221,8 @@ class VideoPlayer:
     # called after a video is finished playing
     def _handle_on_end(self):
         if self.queue_:
+            # thumbnails are read from the video being replaced
+            self._stop_thumbnails()
             if self.loop:
                 self.queue(self.video)
             else:
@@ -174,7 +232,9 @@ class VideoPlayer:
                 self.video = input_
                 self.video.play()
             else:
-                self.video = Video(input_)
+                self.video = self._take_prefetched(input_)
+                if self.video is None:
+                    self.video = Video(input_)
             self._transform(self.frame_rect)
         elif self.loop:
             self.video.restart()
@@ -208,8 +268,8 @@ class VideoPlayer:
 
     def queue(self, input_: Union[str, Video]) -> None:
         """Accept a path to a video or a Video object and add it to the queue.
-        Passing a path will not load the video until it becomes the active
-        video."""
+        Passing a path will not load the video until the last few seconds of
+        the video before it, when it's opened in the background."""
 
         if not isinstance(input_, str) and not isinstance(input_, Video):
             raise ValueError("Can only queue video paths or video objects.")
@@ -260,33 +320,60 @@ class VideoPlayer:
 
         if not self.video.active:
             self._handle_on_end()
+        else:
+            self._prefetch_next()
 
         if self.interactable:
             mouse = pygame.mouse.get_pos()
             click = False
+            release = False
             if events is not None:
                 for event in events:
                     if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                         click = True
+                    elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                        release = True
 
-            self._show_ui = self.frame_rect.collidepoint(mouse) if show_ui is None else show_ui
+            # the bar stays in use while dragging, even outside the player
+            self._show_ui = (self.frame_rect.collidepoint(mouse) if show_ui is None else show_ui) or self._scrubbing
 
             if self._show_ui:
                 self._progress_bar.w = self._progress_back.w * (self.video.get_pos() / self.video.duration)
                 self._smooth_bar += (self._progress_bar.w - self._smooth_bar) * (dt / 100)
-                self._show_seek = self._progress_back.collidepoint(mouse)
+                self._show_seek = self._progress_back.collidepoint(mouse) or self._scrubbing
 
                 if self._show_seek:
                     t = (self._progress_back.w - (self._progress_back.right - mouse[0])) * (
                             self.video.duration / self._progress_back.w)
+                    t = min(max(t, 0), self.video.duration)
 
                     self._seek_pos = self._progress_back.w * (round(t, 1) / self.video.duration) + self._progress_back.x
                     self._seek_time = t
 
-                    if click:
-                        self.video.seek(t, relative=False)
-                        self.video.play()
-                        self._clock.tick()  # resets delta time
+                    if click and not self._scrubbing:
+                        self._scrubbing = True
+                        self._scrub_time = None
+                        self._scrub_paused = self.video.paused
+                        self.video._scrub_keyframe = None
+                        self.video.pause()
+
+                    if self._scrubbing:
+                        if release:
+                            # only now is the exact frame decoded and the audio reloaded
+                            self._scrubbing = False
+                            self.video._scrub_previewer.cancel()
+                            self.video.seek(t, relative=False)
+                            self.video.play()
+                            if not self._scrub_paused:
+                                self.video.resume()
+                            self._clock.tick()  # resets delta time
+                        else:
+                            if round(t, 1) != self._scrub_time:
+                                # just the nearest keyframe while dragging, since that's quick to decode
+                                self._scrub_time = round(t, 1)
+                                self.video._preview_keyframe(t)
+                            # previews are decoded in the background and shown once they're ready
+                            self.video._show_preview()
 
                 elif click:
                     self.video.toggle_pause()
@@ -337,8 +424,8 @@ class VideoPlayer:
                 f = self._font.render(self._convert_seconds(self._seek_time), True, "white")
                 win.blit(f, (self._seek_pos - f.get_width() // 2, self._progress_back.y - 10 - f.get_height()))
 
-                if self._show_intervals:
-                    surf = self._get_closest_frame(self._seek_time)
+                surf = self._get_closest_frame(self._seek_time) if self._show_intervals else None
+                if surf is not None:
                     x = self._seek_pos - surf.get_width() // 2
                     x = min(max(x, self.frame_rect.x), self.frame_rect.right - surf.get_width())
                     width = 1
@@ -364,6 +451,8 @@ class VideoPlayer:
         video player after can lead to unexpected behaviour."""
 
         if not self.closed:
+            self._stop_thumbnails()
+            self._discard_prefetched()
             self.video.close()
             self._close_queue()
             self.closed = True
@@ -375,6 +464,7 @@ class VideoPlayer:
             if self.loop:
                 self.video.stop()
             else:
+                self._stop_thumbnails()
                 self.video.close()
             self._handle_on_end()
 
@@ -386,6 +476,7 @@ class VideoPlayer:
     def clear_queue(self) -> None:
         """Clear queued items."""
 
+        self._discard_prefetched()
         self._close_queue()
         self.queue_.clear()
 
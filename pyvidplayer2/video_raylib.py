@@ -23,12 +23,17 @@ class VideoRaylib(Video):
                  audio_track: int = 0, vfr: bool = False,
                  pref_lang: str = "en", audio_index: int = None,
                  reader: int = READER_AUTO,
-                 cuda_device: int = -1) -> None:
+                 cuda_device: int = -1,
+                 persistent_audio: bool = False,
+                 shared_audio: bool = False,
+                 buffer_pool: int = 0,
+                 decode_ahead: int = 0) -> None:
         Video.__init__(self, path, chunk_size, max_threads, max_chunks, None,
                        post_process, interp, use_pygame_audio,
                        reverse, no_audio, speed, youtube, max_res,
                        as_bytes, audio_track, vfr, pref_lang, audio_index,
-                       reader, cuda_device)
+                       reader, cuda_device, persistent_audio, shared_audio,
+                       buffer_pool, decode_ahead)
 
     def _create_frame(self, data):
         # cannot create textures before window is init
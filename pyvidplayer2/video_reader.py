@@ -1,10 +1,61 @@
 import json
 import subprocess
 
-from . import get_ffmpeg_loglevel, get_ffprobe_path
+from . import get_ffmpeg_loglevel, get_ffprobe_path, probe_cache
 from .error import FFmpegNotFoundError, VideoStreamError
 
 
+def probe(path, as_bytes=False, count_packets=False):
+    '''
+    Runs ffprobe once for every stream and the container format, so video, audio and subtitle
+    information all come from a single subprocess. Packets are only counted when asked for,
+    since it means reading through the entire file.
+    '''
+    info = None if as_bytes else probe_cache.load(path, "probe")
+    if info is not None and (info["counted"] or not count_packets):
+        return info
+
+    # strangely for ffprobe, - is not required to indicate output
+
+    try:
+        # this method counts the number of packets as a substitute for frames, which is much too slow
+        # p = subprocess.Popen(f"ffprobe -i {'-' if as_bytes else path} -show_streams -select_streams v -loglevel {FFMPEG_LOGLVL} -print_format json", stdin=subprocess.PIPE if as_bytes else None, stdout=subprocess.PIPE)
+
+        command = [
+            get_ffprobe_path(),
+            "-i", "-" if as_bytes else path,
+            "-show_streams",
+            "-show_format",
+            *(["-count_packets"] if count_packets else []),
+            "-loglevel", get_ffmpeg_loglevel(),
+            "-print_format", "json"
+        ]
+
+        with subprocess.Popen(command,
+                              stdin=subprocess.PIPE if as_bytes else None,
+                              stdout=subprocess.PIPE) as p:
+            info = json.loads(p.communicate(input=path if as_bytes else None)[0])
+
+    except FileNotFoundError as e:
+        raise FFmpegNotFoundError(
+            "Could not find FFprobe (should be bundled with FFmpeg)."
+            "Make sure FFprobe is installed and accessible via PATH."
+        ) from e
+
+    if len(info) == 0:
+        raise VideoStreamError("Could not determine video.")
+
+    info = {"streams": info.get("streams", []), "format": info.get("format", {}), "counted": count_packets}
+    if not as_bytes:
+        probe_cache.store(path, "probe", info)
+    return info
+
+
+# streams of one type in the order ffprobe lists them, such as "video", "audio" or "subtitle"
+def get_streams(info, codec_type):
+    return [stream for stream in info["streams"] if stream.get("codec_type") == codec_type]
+
+
 class VideoReader:
     def __init__(self, path, probe=False):
         self.frame_count = 0
@@ -14,44 +65,23 @@ class VideoReader:
         self.frame = 0
         self._colour_format = ""
 
+        # number of reused frame buffers, 0 if every read returns a new array
+        self.buffer_pool = 0
+
         self.released = False
 
+        self.probe_info = None  # full ffprobe output, shared with the parent video
+        self.frame_index = None  # exact frame timestamps and keyframes, used for seeking when available
+
         if probe:
             self._probe(path)
 
     # as it turns out, obtaining video data such as frame count and dimensions is actually very inconsistent between
     # different videos and encoders
-    def _probe(self, path, as_bytes=False):
-        # strangely for ffprobe, - is not required to indicate output
-
-        try:
-            # this method counts the number of packets as a substitute for frames, which is much too slow
-            # p = subprocess.Popen(f"ffprobe -i {'-' if as_bytes else path} -show_streams -select_streams v -loglevel {FFMPEG_LOGLVL} -print_format json", stdin=subprocess.PIPE if as_bytes else None, stdout=subprocess.PIPE)
-
-            command = [
-                get_ffprobe_path(),
-                "-i", "-" if as_bytes else path,
-                "-show_streams",
-                "-count_packets",
-                "-select_streams", "v:0",
-                "-loglevel", get_ffmpeg_loglevel(),
-                "-print_format", "json"
-            ]
-
-            with subprocess.Popen(command,
-                                  stdin=subprocess.PIPE if as_bytes else None,
-                                  stdout=subprocess.PIPE) as p:
-                info = json.loads(p.communicate(input=path if as_bytes else None)[0])
-
-        except FileNotFoundError as e:
-            raise FFmpegNotFoundError(
-                "Could not find FFprobe (should be bundled with FFmpeg)."
-                "Make sure FFprobe is installed and accessible via PATH."
-            ) from e
+    def _probe(self, path, as_bytes=False, count_packets=False):
+        self.probe_info = probe(path, as_bytes, count_packets)
 
-        if len(info) == 0:
-            raise VideoStreamError("Could not determine video.")
-        info = info["streams"]
+        info = get_streams(self.probe_info, "video")
         if len(info) == 0:
             raise VideoStreamError("No video tracks found.")
         info = info[0]
@@ -77,16 +107,29 @@ class VideoReader:
         # self.frame_count = int(self.duration * self.frame_rate)
 
         # use header information if available, which should be more accurate than counting packets
-        try:
+        # counting packets means reading through the whole file, so it's only done when asked for
+        # or when there's nothing else to go off of
+        duration = info.get("duration", self.probe_info["format"].get("duration"))
+        if "nb_frames" in info:
             self.frame_count = int(info["nb_frames"])
-        except KeyError:
+        elif "nb_read_packets" in info:
             self.frame_count = int(info["nb_read_packets"])
+        elif duration is not None:
+            self.frame_count = round(float(duration) * self._get_avg_frame_rate(info))
+        else:
+            self._probe(path, as_bytes, count_packets=True)
+            return
 
         try:
             self.duration = float(info["duration"])
         except KeyError:
             self.duration = self.frame_count / self.frame_rate
 
+    # average frame rate gives a better estimate of frame count for variable frame rate videos
+    def _get_avg_frame_rate(self, info):
+        num, den = info.get("avg_frame_rate", "0/0").split("/")
+        return float(num) / float(den) if float(den) and float(num) else self.frame_rate
+
     # not in snake case to match cv2's interface
     def isOpened(self):
         return True
@@ -97,5 +140,32 @@ class VideoReader:
     def read(self):
         pass
 
+    # advances one frame without returning it, readers override this when they can skip conversion
+    def grab(self):
+        return self.read()[0]
+
+    # decoding forward is cheaper than seeking unless there's a keyframe to jump to on the way
+    def _should_seek(self, index):
+        if index < self.frame:
+            return True
+        if self.frame_index is not None:
+            return self.frame_index.get_keyframe(index) > self.frame
+        return index - self.frame > max(int(self.frame_rate), 1)
+
+    # reads frames at sorted indices, stopping early if the video ends
+    def read_batch(self, indices):
+        frames = []
+        for index in indices:
+            if self._should_seek(index):
+                self.seek(index)
+            while self.frame < index and self.grab():
+                pass
+            has_frame, data = self.read()
+            if not has_frame:
+                break
+            # pooled buffers get overwritten by later reads
+            frames.append(data.copy() if self.buffer_pool else data)
+        return frames
+
     def release(self):
         self.released = True
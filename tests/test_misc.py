@@ -77,13 +77,15 @@ class TestMisc(unittest.TestCase):
                                   VideoPyglet, VideoPyQT, VideoPySide,
                                   VideoRaylib, VideoStreamError, VideoTkinter,
                                   VideoWx, Webcam, WebcamNotFoundError,
-                                  YTDLPError, get_ffmpeg_loglevel,
+                                  YTDLPError, clear_probe_cache,
+                                  get_cache_dir, get_ffmpeg_loglevel,
                                   get_ffmpeg_path, get_ffprobe_path,
-                                  get_version_info, set_ffmpeg_loglevel,
-                                  set_ffmpeg_path, set_ffprobe_path)
+                                  get_version_info, set_cache_dir,
+                                  set_ffmpeg_loglevel, set_ffmpeg_path,
+                                  set_ffprobe_path)
         from pyvidplayer2._version import __version__
         import pyvidplayer2
-        self.assertEqual(len(pyvidplayer2.__all__), 33)
+        self.assertEqual(len(pyvidplayer2.__all__), 36)
 
     # tests each post processing function
     def test_post_processing(self):
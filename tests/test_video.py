@@ -1,8 +1,13 @@
 # test resources: https://github.com/anrayliu/pyvidplayer2-test-resources
+import gc
 import importlib.util
 import os
 import random
+import shutil
+import subprocess
 import sys
+import tempfile
+import threading
 import time
 import unittest
 import unittest.mock
@@ -53,6 +58,13 @@ def get_videos():
     return paths
 
 
+# every frame decoded in order, to check reversed playback against
+def read_all_frames(*args, **kwargs):
+    with Video(*args, **kwargs) as v:
+        v._preload_frames()
+        return list(v._preloaded_frames)
+
+
 def timed_loop(seconds, func, dt=0.1):
     t = time.time() + seconds
     while time.time() < t:
@@ -510,6 +522,203 @@ class TestVideo(unittest.TestCase):
 
         self.assertTrue(v._preloaded)
 
+    # tests that preloaded frames can be kept compressed, downscaled or on disk
+    def test_frame_store(self):
+        frames = read_all_frames("resources/clip.mp4", no_audio=True)
+        raw_size = sum(frame.nbytes for frame in frames)
+
+        v = Video("resources/clip.mp4", no_audio=True)
+        self.assertEqual(v.get_frame_store_stats()["storage"], "raw")
+        self.assertRaises(ValueError, v.set_frame_store, "gif")
+
+        v.set_frame_store("png")
+        v._preload_frames()
+        stats = v.get_frame_store_stats()
+        self.assertEqual(stats["frames"], len(frames))
+        self.assertLess(stats["stored_bytes"], raw_size)
+        png_size = stats["stored_bytes"]
+        for i in (0, len(frames) // 2, -1):
+            self.assertTrue(check_same_frames(v._preloaded_frames[i], frames[i]))
+        self.assertRaises(IndexError, v._preloaded_frames.__getitem__, len(frames))
+
+        # already preloaded frames are moved over, decoded frames are limited by the budget
+        v.set_frame_store("jpg", cache_mb=1, quality=80)
+        self.assertTrue(v._preloaded)
+        for i, frame in enumerate(v._preloaded_frames):
+            self.assertLess(np.abs(frame.astype(int) - frames[i]).mean(), 8)
+        stats = v.get_frame_store_stats()
+        self.assertLessEqual(stats["cached_bytes"], 1024 * 1024)
+        self.assertEqual(stats["misses"], len(frames))
+        self.assertLess(stats["stored_bytes"], png_size)
+
+        v.set_frame_store("memmap")
+        v._preload_frames()  # moved frames went through jpg
+        self.assertEqual(v.get_frame_store_stats()["stored_bytes"], 0)
+        path = v._preloaded_frames._mmap_path
+        self.assertTrue(os.path.exists(path))
+        while_loop(lambda: v.frame < 30, v.update, 3)
+        self.assertTrue(check_same_frames(v.frame_data, frames[v.frame - 1]))
+
+        v.set_frame_store("raw", scale=0.5)
+        self.assertEqual(v._preloaded_frames[0].shape[1], round(frames[0].shape[1] / 2))
+        self.assertFalse(os.path.exists(path))
+        v.close()
+        self.assertEqual(v.get_frame_store_stats()["frames"], 0)
+
+        # file is removed even if the store is never cleared
+        store = pyvidplayer2.frame_store.FrameStore("memmap")
+        store.append(frames[0])
+        path = store._mmap_path
+        self.assertTrue(os.path.exists(path))
+        del store
+        gc.collect()
+        self.assertFalse(os.path.exists(path))
+
+    # tests that frames decoded by seeking are kept in a file and found again without the reader
+    def test_disk_cache(self):
+        frames = read_all_frames(VIDEO_PATH, no_audio=True)
+
+        v = Video(VIDEO_PATH, no_audio=True)
+        self.assertEqual(v.get_disk_cache_stats(), {})
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            v.set_disk_cache(frames[0].nbytes * 10 / 1024 / 1024, cache_dir)
+
+            for i in (5, 40, 77):
+                self.assertTrue(check_same_frames(v[i], frames[i]))
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            with unittest.mock.patch.object(v._vid, "seek", wraps=v._vid.seek) as seek:
+                for i in (77, 5, 40):
+                    self.assertTrue(check_same_frames(v[i], frames[i]))
+                seek.assert_not_called()
+
+                # reader catches up once it's actually needed
+                self.assertTrue(check_same_frames(next(v), frames[41]))
+                seek.assert_called_once_with(41)
+
+            stats = v.get_disk_cache_stats()
+            self.assertEqual((stats["hits"], stats["misses"], stats["max_frames"]), (3, 3, 10))
+
+            # least recently used frames make room for new ones
+            for i in range(100, 120):
+                v.seek_frame(i)
+            stats = v.get_disk_cache_stats()
+            self.assertEqual((stats["frames"], stats["evicted"]), (10, 13))
+            self.assertIsNone(v._disk_cache.get(5))
+            self.assertTrue(check_same_frames(v._disk_cache.get(119), frames[119]))
+
+            v.close()
+            self.assertEqual(os.listdir(cache_dir), [])
+
+            # file is removed even if the video is never closed
+            v = Video(VIDEO_PATH, no_audio=True)
+            v.set_disk_cache(frames[0].nbytes * 10 / 1024 / 1024, cache_dir)
+            v.seek_frame(5)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            v._disk_cache = None
+            gc.collect()
+            self.assertEqual(os.listdir(cache_dir), [])
+            v.close()
+
+    # tests that indexing reads forward instead of seeking, and revisited frames come from memory
+    def test_frame_cache(self):
+        frames = read_all_frames(VIDEO_PATH, no_audio=True)
+
+        v = Video(VIDEO_PATH, no_audio=True)
+        self.assertEqual(v.get_frame_cache_stats(), {})
+
+        with unittest.mock.patch.object(v._vid, "seek", wraps=v._vid.seek) as seek:
+            self.assertTrue(check_same_frames(v[10], frames[10]))
+            seek.assert_called_once_with(10)
+
+            # sequential access never seeks
+            for i in range(11, 20):
+                self.assertTrue(check_same_frames(v[i], frames[i]))
+            self.assertTrue(check_same_frames(next(v), frames[20]))
+            seek.assert_called_once()
+
+            v.set_frame_cache(frames[0].nbytes * 5 / 1024 / 1024, read_forward=10)
+            for i in (25, 35, 50):
+                self.assertTrue(check_same_frames(v[i], frames[i]))
+            self.assertEqual(seek.call_count, 2)
+            seek.assert_called_with(50)
+
+            for i in (35, 25, 50, 35):
+                self.assertTrue(check_same_frames(v[i], frames[i]))
+            self.assertEqual(seek.call_count, 2)
+
+            # plays on from the last frame shown
+            while_loop(lambda: v.frame < 40, v.update, 3)
+            self.assertTrue(check_same_frames(v.frame_data, frames[v.frame - 1]))
+            seek.assert_called_with(36)
+
+        stats = v.get_frame_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["frames"]), (4, 3, 3))
+
+        for i in range(50, 60):
+            v.seek_frame(i)
+        stats = v.get_frame_cache_stats()
+        self.assertEqual((stats["frames"], stats["evicted"]), (5, 7))
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+
+        v.set_frame_cache(0)
+        self.assertEqual(v.get_frame_cache_stats(), {})
+        v.close()
+
+    # tests extracting frames in batches without affecting playback
+    def test_get_frames(self):
+        frames = read_all_frames(VIDEO_PATH, no_audio=True)
+
+        v = Video(VIDEO_PATH, no_audio=True)
+        while_loop(lambda: v.frame < 10, v.update, 3)
+        frame = v.frame
+
+        batch = v.get_frames([30, 5, 5, -1])
+        self.assertEqual(batch.shape, (4, v.current_size[1], v.current_size[0], 3))
+        for data, i in zip(batch, (30, 5, 5, len(frames) - 1)):
+            self.assertTrue(check_same_frames(data, frames[i]))
+        self.assertRaises(IndexError, v.get_frames, [v.frame_count])
+        self.assertEqual(v.get_frames([]).shape[0], 0)
+
+        # nearby frames are decoded forward
+        with unittest.mock.patch.object(v._vid, "seek", wraps=v._vid.seek) as seek:
+            batch = v.get_frames(range(40, 52, 2))
+            self.assertLessEqual(seek.call_count, 1)
+        self.assertTrue(all(check_same_frames(data, frames[i]) for data, i in zip(batch, range(40, 52, 2))))
+
+        # playback carries on from where it was
+        self.assertEqual(v.frame, frame)
+        while_loop(lambda: v.frame < frame + 5, v.update, 3)
+        self.assertTrue(check_same_frames(v.frame_data, frames[v.frame - 1]))
+
+        batches = list(v.iter_batches(16, step=3))
+        self.assertEqual([len(batch) for batch in batches[:-1]], [16] * (len(batches) - 1))
+        batch = np.concatenate(batches)
+        self.assertEqual(len(batch), len(frames[::3]))
+        self.assertTrue(all(check_same_frames(data, frames[i * 3]) for i, data in enumerate(batch)))
+        v.close()
+
+        # post-processing can change the shape of frames
+        with Video(VIDEO_PATH, no_audio=True, post_process=PostProcessing.rotate90) as v:
+            w, h = v.current_size
+            batch = v.get_frames([8, 2])
+            self.assertEqual(batch.shape, (2, w, h, 3))
+            self.assertTrue(np.array_equal(batch[1], PostProcessing.rotate90(frames[2])))
+            batch = next(v.iter_batches(4))
+            self.assertEqual(batch.shape, (4, w, h, 3))
+            self.assertTrue(np.array_equal(batch[3], PostProcessing.rotate90(frames[3])))
+
+        # decord reads batches in a single call
+        for reader in (READER_DECORD, READER_IMAGEIO):
+            with open(VIDEO_PATH, "rb") as f:
+                data = f.read()
+            frames = read_all_frames(data, reader=reader, no_audio=True)
+            with Video(data, reader=reader, no_audio=True) as v:
+                batch = v.get_frames([20, 3, 50])
+                self.assertTrue(all(check_same_frames(data, frames[i]) for data, i in zip(batch, (20, 3, 50))))
+                self.assertTrue(check_same_frames(next(v), frames[0]))
+
     # tests cv2 frame count, proving frame count, and real frame count
     def test_frame_counts(self):
         for file in PATHS:
@@ -932,6 +1141,39 @@ class TestVideo(unittest.TestCase):
         self.assertEqual(v._get_closest_frame([10, 20, 30], 35), 2)  # Closest to 35 is index 2 (30)
         v.close()
 
+    # tests that the number of frames due matches checking each frame's time one by one
+    def test_get_frames_due(self):
+        v = Video(VIDEO_PATH)
+
+        def has_frame(p, frame, pts=None):
+            if pts is not None:
+                return frame < v.frame_count and p > pts[frame]
+            return p > frame / float(v.frame_rate)
+
+        def count_due(p, pts=None):
+            frame = v.frame
+            while has_frame(p, frame, pts):
+                frame += 1
+            return frame - v.frame
+
+        positions = [0, 0.5 / v.frame_rate, 1 / v.frame_rate, 10 / v.frame_rate, 1.0, 2.5, v.duration, v.duration + 5]
+        positions += [random.uniform(0, v.duration) for _ in range(50)]
+
+        for frame in (0, 10, 24):
+            v.frame = frame
+            for p in positions:
+                self.assertEqual(v._get_frames_due(p), count_due(p))
+
+        v._timestamps = np.cumsum(np.random.default_rng(0).uniform(0.01, 0.1, v.frame_count)) - 0.01
+        for frame in (0, 10, 24):
+            v.frame = frame
+            for p in positions + v._timestamps[:50].tolist():
+                self.assertEqual(v._get_frames_due(p), count_due(p, v._timestamps))
+
+        self.assertEqual(v._get_closest_frame(np.array([1.0, 3.0, 5.0]), 3.0), 1)
+        self.assertEqual(v._get_closest_frame(np.array([]), 3.0), 0)
+        v.close()
+
     # tests that an error is raised if missing ffmpeg
     def test_missing_ffmpeg(self):
         v = Video(VIDEO_PATH)
@@ -964,6 +1206,7 @@ class TestVideo(unittest.TestCase):
     # test playing video in reverse and sped up
     def test_reversed_and_speed(self):
         # using pygame audio for higher fps limit
+        reference = read_all_frames(VIDEO_PATH, no_audio=True)
         v = Video(VIDEO_PATH, reverse=True, speed=3, use_pygame_audio=True)
         seconds_elapsed = 0
         clock = pygame.time.Clock()
@@ -981,7 +1224,7 @@ class TestVideo(unittest.TestCase):
                 frames = 0
             if v.update():
                 frames += 1
-                self.assertTrue(check_same_frames(v.frame_data, v._preloaded_frames[v.frame_count - v.frame]))
+                self.assertTrue(check_same_frames(v.frame_data, reference[v.frame_count - v.frame]))
         # check that frame rate kept up
         self.assertGreaterEqual(avg_fps / v.duration, v.frame_rate * 0.9)
         v.close()
@@ -990,6 +1233,7 @@ class TestVideo(unittest.TestCase):
     # pretty much a copy and paste of the above test, but
     # no audio caused bugs in the past, so this test is worth keeping
     def test_reversed_and_speed_and_silent(self):
+        reference = read_all_frames(VIDEO_PATH, no_audio=True)
         v = Video(VIDEO_PATH, reverse=True, speed=3, use_pygame_audio=True, no_audio=True)
         seconds_elapsed = 0
         clock = pygame.time.Clock()
@@ -1007,7 +1251,7 @@ class TestVideo(unittest.TestCase):
                 frames = 0
             if v.update():
                 frames += 1
-                self.assertTrue(check_same_frames(v.frame_data, v._preloaded_frames[v.frame_count - v.frame]))
+                self.assertTrue(check_same_frames(v.frame_data, reference[v.frame_count - v.frame]))
         self.assertGreaterEqual(avg_fps / v.duration, v.frame_rate * 0.9)
         v.close()
 
@@ -1114,11 +1358,12 @@ class TestVideo(unittest.TestCase):
 
     # tests seeking for reversed videos
     def test_reverse_seek(self):
+        frames = read_all_frames(VIDEO_PATH, no_audio=True)
         v = Video(VIDEO_PATH, reverse=True)
         v.seek_frame(0, intuitive=False)
-        self.assertTrue(check_same_frames(next(v), v._preloaded_frames[-1]))
+        self.assertTrue(check_same_frames(next(v), frames[-1]))
         v.seek_frame(v.frame_count - 1, intuitive=False)
-        self.assertTrue(check_same_frames(next(v), v._preloaded_frames[0]))
+        self.assertTrue(check_same_frames(next(v), frames[0]))
         v.close()
 
     # tests video in a context manager
@@ -1370,7 +1615,8 @@ class TestVideo(unittest.TestCase):
 
         # play a bit of audio and check that sounddevice is being utilized
         while_loop(lambda: v.frame < 10, v.update, 5)
-        self.assertTrue(v._audio.thread is not None and v._audio.thread.is_alive())
+        self.assertTrue(v._audio.stream is not None and v._audio.stream.active)
+        self.assertGreater(v._audio.frames_played, 0)
 
         v.close()
 
@@ -1401,25 +1647,28 @@ class TestVideo(unittest.TestCase):
         PATH = "resources/clip.mp4"
 
         for vfr in (True, False):
+            frames = read_all_frames(PATH, vfr=vfr)
             v = Video(PATH, reverse=True, vfr=vfr)
             for i, frame in enumerate(v):
-                self.assertTrue(check_same_frames(frame, v._preloaded_frames[v.frame_count - i - 1]))
+                self.assertTrue(check_same_frames(frame, frames[v.frame_count - i - 1]))
             v.close()
         for reader in (READER_DECORD, READER_IMAGEIO):
             with open(PATH, "rb") as f:
-                v = Video(f.read(), reverse=True, reader=reader)
+                data = f.read()
+                frames = read_all_frames(data, reader=reader)
+                v = Video(data, reverse=True, reader=reader)
                 for i, frame in enumerate(v):
-                    self.assertTrue(check_same_frames(frame, v._preloaded_frames[v.frame_count - i - 1]))
+                    self.assertTrue(check_same_frames(frame, frames[v.frame_count - i - 1]))
                 v.close()
 
     # tests that the correct pts are extracted for vfr videos
     def test_get_timestamps(self):
         v = Video(VIDEO_PATH, vfr=True)
-        self.assertEqual(v.timestamps[:10], [0.0, 0.041708, 0.083417, 0.125125, 0.166833, 0.208542, 0.25025, 0.291958,
-                                             0.333667, 0.375375])
-        self.assertEqual(v.timestamps[-10:], [66.858458, 66.900167,
-                                              66.941875, 66.983583, 67.025292, 67.067, 67.108708, 67.150417, 67.192125,
-                                              67.233833])
+        self.assertEqual(v.timestamps[:10].tolist(), [0.0, 0.041708, 0.083417, 0.125125, 0.166833, 0.208542, 0.25025,
+                                                      0.291958, 0.333667, 0.375375])
+        self.assertEqual(v.timestamps[-10:].tolist(), [66.858458, 66.900167,
+                                                       66.941875, 66.983583, 67.025292, 67.067, 67.108708, 67.150417,
+                                                       67.192125, 67.233833])
         v.close()
 
     # test __str__ from bytes
@@ -1555,7 +1804,7 @@ class TestVideo(unittest.TestCase):
         # test correct args
         v = Video(VIDEO_PATH, 10, 1, 1, None, PostProcessing.none, "linear",
                   False, False, False, 1, False, 1080,
-                  False, 0, False, "en", None, READER_AUTO, -1)
+                  False, 0, False, "en", None, READER_AUTO, -1, False, False, 0, 0)
         v.close()
         for videoClass in (
                 VideoTkinter,
@@ -1567,14 +1816,14 @@ class TestVideo(unittest.TestCase):
         ):
             v = videoClass(VIDEO_PATH, 10, 1, 1, PostProcessing.none, "linear",
                            False, False, False, 1, False, 1080,
-                           False, 0, False, "en", None, READER_AUTO, -1)
+                           False, 0, False, "en", None, READER_AUTO, -1, False, False, 0, 0)
             v.close()
 
         # test extra args
         with self.assertRaises(TypeError):
             Video(VIDEO_PATH, 10, 1, 1, None, PostProcessing.none, "linear",
                   False, False, False, 1, False, 1080,
-                  False, 0, False, "en", None, READER_AUTO, -1, "extra_arg")
+                  False, 0, False, "en", None, READER_AUTO, -1, False, False, 0, 0, "extra_arg")
 
         for videoClass in (
             VideoTkinter,
@@ -1587,7 +1836,7 @@ class TestVideo(unittest.TestCase):
             with self.assertRaises(TypeError):
                 videoClass(VIDEO_PATH, 10, 1, 1, PostProcessing.none, "linear",
                            False, False, False, 1, False, 1080,
-                           False, 0, False, "en", None, READER_AUTO, -1,
+                           False, 0, False, "en", None, READER_AUTO, -1, False, False, 0, 0,
                            "extra_arg")
 
     # tests that each backend can be forced
@@ -1787,10 +2036,11 @@ class TestVideo(unittest.TestCase):
 
     # tests that buffer current works for videos in reverse
     def test_reverse_buffer_current(self):
+        frames = read_all_frames("resources/clip.mp4")
         v = Video("resources/clip.mp4", reverse=True)
         self.assertFalse(v.buffer_current())
         v.seek_frame(0, intuitive=True)
-        self.assertTrue(check_same_frames(v.frame_data, v._preloaded_frames[-1]))
+        self.assertTrue(check_same_frames(v.frame_data, frames[-1]))
         v.close()
 
     # test what seeking buffers current
@@ -2501,6 +2751,645 @@ class TestVideo(unittest.TestCase):
 
             self.assertTrue(check_same_frames(base, target))
 
+    # tests that persistent audio reuses one ffmpeg process until seeking
+    def test_persistent_audio(self):
+        for audio_handler in (False, True):
+            v = Video(VIDEO_PATH, chunk_size=1, persistent_audio=True, use_pygame_audio=audio_handler)
+            self.assertTrue(v.persistent_audio)
+            self.assertGreater(v.audio_sample_rate, 0)
+
+            while_loop(lambda: v._audio_process is None, v.update, 10)
+            process = v._audio_process
+
+            # several chunks should be extracted from the same process
+            while_loop(lambda: v._chunks_played < 3, v.update, 10)
+            self.assertIs(v._audio_process, process)
+            self.assertEqual(v._processes, [process])
+
+            v.seek(10, relative=False)
+            self.assertIsNone(v._audio_process)
+            self.assertNotEqual(process.poll(), None)
+
+            while_loop(lambda: v.frame_data is None or v._audio_process is None, v.update, 10)
+            self.assertIsNot(v._audio_process, process)
+            self.assertAlmostEqual(v.get_pos(), 10, delta=1)
+
+            v.close()
+            self.assertEqual(v._processes, [])
+
+        # reversed videos fall back to chunked extraction
+        v = Video(VIDEO_PATH, persistent_audio=True, reverse=True)
+        while_loop(lambda: v._chunks_played < 1, v.update, 10)
+        self.assertIsNone(v._audio_process)
+        v.close()
+
+    # tests that audio chunks are extracted as raw pcm arrays instead of wav files
+    def test_raw_audio_chunks(self):
+        for persistent in (False, True):
+            v = Video(VIDEO_PATH, chunk_size=1, persistent_audio=persistent)
+            while_loop(lambda: not v._chunks or v._chunks[0] is None, v.update, 10)
+
+            chunk = v._chunks[0]
+            sample_rate, channels = v._get_audio_format()
+            self.assertIsInstance(chunk, np.ndarray)
+            self.assertEqual(chunk.dtype, np.int16)
+            self.assertEqual(chunk.shape[1], channels)
+            self.assertEqual(sample_rate, v.audio_sample_rate)
+            self.assertAlmostEqual(len(chunk) / sample_rate, 1, delta=0.05)
+
+            v.close()
+
+        v = Video(VIDEO_PATH, chunk_size=1, no_audio=True)
+        while_loop(lambda: not v._chunks or v._chunks[0] is None, v.update, 10)
+        self.assertEqual(v._chunks[0].shape, (44100, 2))
+        self.assertFalse(np.any(v._chunks[0]))
+        v.close()
+
+    # tests that sounddevice audio is played from the ring buffer by the stream callback
+    def test_psd_callback_playback(self):
+        v = Video(VIDEO_PATH, chunk_size=1)
+        while_loop(lambda: not v._audio.loaded, v.update, 10)
+
+        # ring buffer is sized to fit one chunk
+        ring = v._audio.ring
+        self.assertAlmostEqual(ring.capacity, v.audio_sample_rate, delta=v.audio_sample_rate * 0.05)
+
+        while_loop(lambda: v.frame < 10, v.update, 10)
+        self.assertGreater(ring.read_count, 0)
+        self.assertLessEqual(ring.read_count, ring.write_count)
+
+        # position should follow the stream clock
+        pos = v._audio.get_pos()
+        self.assertGreater(pos, 0)
+        self.assertLessEqual(pos, v._audio.frames_played / v._audio.stream.samplerate)
+
+        # position freezes while paused
+        v.pause()
+        time.sleep(0.3)
+        pos = v._audio.get_pos()
+        time.sleep(0.3)
+        self.assertEqual(pos, v._audio.get_pos())
+        v.resume()
+
+        # ring buffer is reused between chunks of the same size
+        while_loop(lambda: v._chunks_played < 3, v.update, 10)
+        self.assertIs(v._audio.ring, ring)
+
+        v.close()
+
+    # tests that shared audio videos play through one output stream
+    def test_shared_audio(self):
+        from pyvidplayer2.psd_mixer import PSDMixer
+
+        videos = [Video(VIDEO_PATH, shared_audio=True) for _ in range(3)]
+        self.assertEqual(type(videos[0]._audio).__name__, "PSDMixerHandler")
+
+        for v in videos:
+            v.set_volume(0.5)
+            # audio is resampled to the mixer's sample rate
+            self.assertEqual(v._get_audio_format()[0], v._audio.get_sample_rate())
+
+        while_loop(lambda: any(v.frame < 10 for v in videos), lambda: [v.update() for v in videos], 10)
+
+        mixer = videos[0]._audio.mixer
+        self.assertEqual(len(PSDMixer.mixers), 1)
+        self.assertEqual(len(mixer.sources), 3)
+        for v in videos:
+            self.assertIs(v._audio.stream, mixer.stream)
+            # each source keeps its own position
+            self.assertAlmostEqual(v.get_pos(), v.frame / v.frame_rate, delta=0.5)
+
+        videos[0].pause()
+        pos = videos[0].get_pos()
+        timed_loop(0.5, lambda: [v.update() for v in videos])
+        self.assertEqual(videos[0].get_pos(), pos)
+        self.assertGreater(videos[1].get_pos(), pos)
+
+        for v in videos:
+            v.close()
+        self.assertEqual(PSDMixer.mixers, {})
+
+        # videos started and closed from several threads at once still share one mixer per device
+        videos = [Video(VIDEO_PATH, shared_audio=True) for _ in range(4)]
+        threads = [threading.Thread(target=while_loop, args=(lambda v=v: v._chunks_played < 1, v.update, 10, 0))
+                   for v in videos]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(PSDMixer.mixers), 1)
+        self.assertEqual(len(videos[0]._audio.mixer.sources), 4)
+        threads = [threading.Thread(target=v.close) for v in videos]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(PSDMixer.mixers, {})
+
+    # tests that the ffmpeg reader can decode into a pool of reused buffers
+    def test_buffer_pool(self):
+        with self.assertRaises(Pyvidplayer2Error) as ctx:
+            Video(VIDEO_PATH, buffer_pool=3)
+        self.assertIn("Must use FFmpeg reader for buffer pools.", str(ctx.exception))
+
+        v1 = Video(VIDEO_PATH, reader=READER_FFMPEG)
+        v2 = Video(VIDEO_PATH, reader=READER_FFMPEG, buffer_pool=3)
+        self.assertEqual(v1._vid.buffer_pool, 0)
+        self.assertEqual(v2._vid.buffer_pool, 3)
+
+        frames = []
+        for _ in range(10):
+            frame = next(v2)
+            self.assertTrue(check_same_frames(next(v1), frame))
+            frames.append(frame)
+
+        # frames should rotate through the same preallocated arrays
+        self.assertEqual(len(v2._vid._buffers), 3)
+        self.assertTrue(all(any(f is b for b in v2._vid._buffers) for f in frames))
+        self.assertIs(frames[0], frames[3])
+
+        # pool sizes under 2 would overwrite the frame being displayed
+        v3 = Video(VIDEO_PATH, reader=READER_FFMPEG, buffer_pool=1)
+        self.assertEqual(v3._vid.buffer_pool, 2)
+
+        # preloaded frames can't share buffers
+        v2._preload_frames()
+        self.assertFalse(any(f is b for f in v2._preloaded_frames for b in v2._vid._buffers))
+
+        v1.close()
+        v2.close()
+        v3.close()
+
+    # tests that frames decoded ahead on a background thread match frames read directly
+    def test_decode_ahead(self):
+        for reader in (READER_FFMPEG, READER_OPENCV):
+            v1 = Video(VIDEO_PATH, reader=reader)
+            v2 = Video(VIDEO_PATH, reader=reader, decode_ahead=8)
+            self.assertEqual(v1.get_decode_stats(), {})
+            self.assertEqual(v2.decode_ahead, 8)
+            self.assertTrue(v2._get_frame_queue_running())
+
+            for frame1, frame2 in zip(v1, v2):
+                self.assertTrue(check_same_frames(frame1, frame2))
+            self.assertEqual(v1.frame, v2.frame)
+
+            # seeking and resizing should restart the worker from the right frame
+            v1.seek_frame(50)
+            v2.seek_frame(50)
+            self.assertTrue(check_same_frames(v1.frame_data, v2.frame_data))
+            v1.resize((320, 180))
+            v2.resize((320, 180))
+            frame1, frame2 = next(v1), next(v2)
+            self.assertEqual(frame2.shape, (180, 320, 3))
+            self.assertTrue(check_same_frames(frame1, frame2))
+
+            v2.play()
+            while v2.active:
+                v2.update()
+                time.sleep(0.005)
+            stats = v2.get_decode_stats()
+            self.assertGreater(stats["popped"], 0)
+            self.assertLessEqual(stats["peak_depth"], 8)
+            self.assertEqual(stats["drop_policy"], "late")
+
+            v2.set_decode_ahead(4, "none")
+            self.assertEqual(v2.get_decode_stats()["max_depth"], 4)
+            with self.assertRaises(ValueError):
+                v2.set_decode_ahead(4, "oldest")
+
+            v2.set_decode_ahead(0)
+            self.assertEqual(v2.get_decode_stats(), {})
+            self.assertEqual(v2._vid.frame, v2.frame)
+
+            v1.close()
+            v2.close()
+
+    # tests that late frames are skipped by the decode-ahead worker instead of being post-processed
+    def test_decode_ahead_drops(self):
+        processed = []
+
+        def slow_post_func(data):
+            processed.append(data)
+            time.sleep(0.02)
+            return data
+
+        v = Video(VIDEO_PATH, speed=5, decode_ahead=4, post_process=slow_post_func)
+        while v.active:
+            v.update()
+            time.sleep(0.03)
+        stats = v.get_decode_stats()
+        self.assertGreater(stats["dropped"], 0)
+        self.assertLess(len(processed), stats["decoded"])
+        v.close()
+
+    # tests that iterating still returns every frame when the decode-ahead worker has dropped some
+    def test_decode_ahead_iteration(self):
+        frames = read_all_frames(VIDEO_PATH, no_audio=True)
+
+        v = Video(VIDEO_PATH, no_audio=True)
+        v.set_decode_ahead(8, "late")
+        # as if update had been called while playback was running behind
+        v._frame_queue.pos = 3.0
+        for i in range(30):
+            self.assertTrue(check_same_frames(next(v), frames[i]))
+        self.assertEqual(v.frame, 30)
+        self.assertGreater(v.get_decode_stats()["dropped"], 0)
+        v.close()
+
+    # tests that readers can skip frames without returning them
+    def test_reader_grab(self):
+        for reader in (
+            READER_OPENCV,
+            READER_FFMPEG,
+            READER_IMAGEIO,
+            READER_DECORD
+        ):
+            v1 = Video(VIDEO_PATH, reader=reader)
+            v2 = Video(VIDEO_PATH, reader=reader)
+
+            for _ in range(10):
+                v1._vid.read()
+                self.assertTrue(v2._vid.grab())
+            self.assertEqual(v1._vid.frame, 10)
+            self.assertEqual(v2._vid.frame, 10)
+            self.assertTrue(check_same_frames(v1._vid.read()[1], v2._vid.read()[1]))
+
+            v2.seek_frame(v2.frame_count - 1, intuitive=False)
+            self.assertTrue(v2._vid.grab())
+            self.assertFalse(v2._vid.grab())
+
+            v1.close()
+            v2.close()
+
+    # tests that frames skipped at high speeds are grabbed instead of read
+    def test_high_speed_grab(self):
+        for reader in (READER_OPENCV, READER_FFMPEG):
+            v = Video(VIDEO_PATH, reader=reader, speed=8)
+            with unittest.mock.patch.object(v._vid, "read", wraps=v._vid.read) as read, \
+                    unittest.mock.patch.object(v._vid, "grab", wraps=v._vid.grab) as grab:
+                timed_loop(2, v.update, 1 / 60)
+            self.assertGreater(grab.call_count, read.call_count)
+            self.assertIsNotNone(v.frame_data)
+            v.close()
+
+    # tests that the ffmpeg reader scales frames while decoding
+    def test_reader_scaling(self):
+        v = Video(VIDEO_PATH, reader=READER_FFMPEG)
+        self.assertEqual(v._vid._get_scale_filter(), "")
+
+        v.resize((320, 180))
+        self.assertEqual(v._vid._get_scale_filter(), "scale=320:180:flags=bilinear,")
+        self.assertEqual(v._vid.read()[1].shape, (180, 320, 3))
+
+        with unittest.mock.patch.object(v, "_resize_frame", wraps=v._resize_frame) as resize:
+            frame = next(v)
+            resize.assert_not_called()
+        self.assertEqual(frame.shape, (180, 320, 3))
+
+        v.set_interp("area")
+        self.assertEqual(v._vid._get_scale_filter(), "scale=320:180:flags=area,")
+
+        # scaling should stop when returning to the original size
+        v.resize(v.original_size)
+        self.assertEqual(v._vid._get_scale_filter(), "")
+        self.assertEqual(next(v).shape, (v.original_size[1], v.original_size[0], 3))
+
+        v.close()
+
+    # tests that resizing without opencv reuses one ffmpeg process per geometry
+    def test_ffmpeg_scaler(self):
+        v = Video(VIDEO_PATH, reader=READER_DECORD)
+        data = v._vid.read()[1]
+
+        with unittest.mock.patch("pyvidplayer2.video.CV", 0):
+            frames = [v._resize_frame(data, (320, 180), v.interp, True) for _ in range(10)]
+            self.assertEqual(len(v._scalers), 1)
+            scaler = next(iter(v._scalers.values()))
+            self.assertEqual(frames[0].shape, (180, 320, 3))
+            self.assertTrue(all(check_same_frames(frames[0], frame) for frame in frames))
+
+            # should be close to opencv's resampling
+            expected = cv2.resize(data, (320, 180), interpolation=cv2.INTER_LINEAR)
+            self.assertLess(np.abs(frames[0].astype(int) - expected).mean(), 3)
+
+            # oldest geometries are closed once too many are open
+            for i in range(pyvidplayer2.video.MAX_SCALERS):
+                v._resize_frame(data, (100 + i * 2, 100), v.interp, True)
+            self.assertEqual(len(v._scalers), pyvidplayer2.video.MAX_SCALERS)
+            self.assertIsNotNone(scaler._process.poll())
+
+            processes = [s._process for s in v._scalers.values()]
+            v.close()
+            self.assertEqual(v._scalers, {})
+            self.assertTrue(all(p.poll() is not None for p in processes))
+
+        # scalers evicted by one thread aren't closed while the decode-ahead thread is still using them
+        scale = pyvidplayer2.ffmpeg_scaler.FFmpegScaler.scale
+
+        def slow_scale(scaler, frame):
+            time.sleep(0.005)  # widens the gap between fetching a scaler and using it
+            return scale(scaler, frame)
+
+        with unittest.mock.patch("pyvidplayer2.video.CV", 0), \
+                unittest.mock.patch.object(pyvidplayer2.ffmpeg_scaler.FFmpegScaler, "scale", slow_scale):
+            v = Video(VIDEO_PATH, reader=READER_DECORD, no_audio=True, decode_ahead=2)
+            v.resize((320, 180))
+            popped = 0
+            for i in range(30):
+                for j in range(pyvidplayer2.video.MAX_SCALERS + 1):
+                    self.assertEqual(v._resize_frame(data, (100 + j * 2, 100), v.interp, True).shape, (100, 100 + j * 2, 3))
+                    # keeps the worker scaling while geometries are evicted
+                    while v._frame_queue.pop() is not None:
+                        popped += 1
+                self.assertTrue(v._frame_queue._thread.is_alive())
+            self.assertGreater(popped, 0)
+            self.assertEqual(next(v).shape, (180, 320, 3))
+            v.close()
+
+    # tests that reopening a file reuses earlier probe results
+    def test_probe_cache(self):
+        pyvidplayer2.clear_probe_cache()
+        self.addCleanup(pyvidplayer2.clear_probe_cache)
+        self.addCleanup(lambda: pyvidplayer2.set_cache_dir(None))
+
+        v = Video(VIDEO_PATH, reader=READER_FFMPEG)
+        metadata = (v.frame_count, v.frame_rate, v.duration, v.original_size, v.audio_channels, v.no_audio)
+        v.close()
+
+        with unittest.mock.patch("subprocess.Popen", wraps=subprocess.Popen) as popen:
+            v = Video(VIDEO_PATH, reader=READER_FFMPEG)
+            commands = [call.args[0] for call in popen.call_args_list]
+        self.assertEqual((v.frame_count, v.frame_rate, v.duration, v.original_size, v.audio_channels, v.no_audio), metadata)
+        v.close()
+
+        # only the video reader and audio loader should've been started
+        self.assertFalse(any(command[0] == get_ffprobe_path() for command in commands))
+        self.assertFalse(any("-t" in command for command in commands))
+
+        # results are saved to disk and survive clearing the memory cache
+        with tempfile.TemporaryDirectory() as cache_dir:
+            pyvidplayer2.set_cache_dir(cache_dir)
+            pyvidplayer2.clear_probe_cache()
+            Video(VIDEO_PATH, reader=READER_FFMPEG).close()
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            pyvidplayer2.clear_probe_cache()
+            with unittest.mock.patch("subprocess.Popen", wraps=subprocess.Popen) as popen:
+                Video(VIDEO_PATH, reader=READER_FFMPEG).close()
+                commands = [call.args[0] for call in popen.call_args_list]
+            self.assertFalse(any(command[0] == get_ffprobe_path() for command in commands))
+
+            pyvidplayer2.set_cache_dir(None)
+
+        # changing the file invalidates its entry
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "copy.mp4")
+            shutil.copy("resources/clip.mp4", path)
+            Video(path, reader=READER_FFMPEG).close()
+            shutil.copy(VIDEO_PATH, path)
+            v = Video(path, reader=READER_FFMPEG)
+            self.assertEqual(v.frame_count, metadata[0])
+            v.close()
+
+    # tests that video construction only probes the file once
+    def test_single_probe(self):
+        self.addCleanup(pyvidplayer2.clear_probe_cache)
+
+        for reader in (READER_FFMPEG, READER_OPENCV, READER_DECORD, READER_IMAGEIO):
+            pyvidplayer2.clear_probe_cache()
+            with unittest.mock.patch("subprocess.Popen", wraps=subprocess.Popen) as popen:
+                v = Video(VIDEO_PATH, reader=reader)
+                commands = [call.args[0] for call in popen.call_args_list]
+
+            self.assertEqual(sum(command[0] == get_ffprobe_path() for command in commands), 1)
+            self.assertFalse(any("-t" in command for command in commands))  # no test decode for audio
+            self.assertEqual(v.num_audio_tracks, 1)
+            self.assertEqual(v.audio_channels, 2)
+            self.assertFalse(v.no_audio)
+
+            # probe results are shared between the reader and the video
+            self.assertIs(v._get_probe_info(), v._vid.probe_info)
+            self.assertEqual(len(pyvidplayer2.video_reader.get_streams(v._get_probe_info(), "video")), 1)
+            self.assertIn("duration", v._get_probe_info()["format"])
+            v.close()
+
+        with open(VIDEO_PATH, "rb") as file:
+            data = file.read()
+        with unittest.mock.patch("subprocess.Popen", wraps=subprocess.Popen) as popen:
+            v = Video(data)
+            commands = [call.args[0] for call in popen.call_args_list]
+        self.assertEqual(sum(command[0] == get_ffprobe_path() for command in commands), 1)
+        self.assertEqual(v.audio_channels, 2)
+        v.close()
+
+        with Video("resources/myGif.gif") as v:
+            self.assertTrue(v.no_audio)
+
+    # tests that frame count is estimated from headers, and only counted when asked for
+    def test_frame_count_estimate(self):
+        self.addCleanup(pyvidplayer2.clear_probe_cache)
+        pyvidplayer2.clear_probe_cache()
+
+        # mkv files don't store a frame count
+        v = Video("resources/6channels.mkv", reader=READER_FFMPEG)
+        stream = pyvidplayer2.video_reader.get_streams(v._get_probe_info(), "video")[0]
+        self.assertNotIn("nb_frames", stream)
+        self.assertNotIn("nb_read_packets", stream)
+        self.assertFalse(v._get_probe_info()["counted"])
+        estimate = v.frame_count
+
+        v.probe(background=True)
+        v._probe_thread.join()
+        self.assertTrue(v._get_probe_info()["counted"])
+        self.assertEqual(v.frame_count, int(pyvidplayer2.video_reader.get_streams(v._get_probe_info(), "video")[0]["nb_read_packets"]))
+        self.assertLessEqual(abs(v.frame_count - estimate), 1)
+        v.close()
+
+        # header frame count is still preferred
+        v = Video(VIDEO_PATH, reader=READER_FFMPEG)
+        self.assertEqual(v.frame_count, 1613)
+        v.probe()
+        self.assertEqual(v.frame_count, 1613)
+        v.close()
+
+    # tests that vfr timestamps are indexed without holding up playback
+    def test_vfr_background_index(self):
+        self.addCleanup(pyvidplayer2.clear_probe_cache)
+        pyvidplayer2.clear_probe_cache()
+
+        release = threading.Event()
+        get_all_pts = Video._get_all_pts
+
+        def slow_get_all_pts(video):
+            release.wait()
+            return get_all_pts(video)
+
+        with unittest.mock.patch.object(Video, "_get_all_pts", slow_get_all_pts):
+            v = Video("resources/vfr.mp4", vfr=True)
+
+            # nominal frame rate is used until the index is ready
+            self.assertIsNone(v._timestamps)
+            self.assertEqual(v._get_frame_time(10), 10 / v.frame_rate)
+            while_loop(lambda: v.frame < 5, v.update, 10)
+
+            release.set()
+            self.assertEqual(v.timestamps.dtype, np.float64)
+            # the last packet is discarded by the decoder, so it has no timestamp but is in the frame count
+            self.assertEqual(len(v.timestamps), v.frame_count - 1)
+            self.assertEqual(v.timestamps[0], 0.0)
+            self.assertTrue(np.all(np.diff(v.timestamps) > 0))
+            self.assertIs(v._timestamps, v.timestamps)
+            self.assertNotEqual(v.min_fr, v.max_fr)
+
+            v.seek_frame(20, intuitive=False)
+            self.assertEqual(v.get_pos(), v.timestamps[20])
+            v.close()
+
+        # not in vfr mode
+        with Video(VIDEO_PATH) as v:
+            self.assertEqual(len(v.timestamps), 0)
+            self.assertEqual(v.min_fr, v.frame_rate)
+
+    # tests that vfr timestamps are saved with the frame index instead of the probe cache
+    def test_vfr_saved_timestamps(self):
+        self.addCleanup(pyvidplayer2.clear_probe_cache)
+        self.addCleanup(lambda: pyvidplayer2.set_cache_dir(None))
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            pyvidplayer2.set_cache_dir(cache_dir)
+
+            with Video("resources/vfr.mp4", vfr=True, no_audio=True) as v:
+                timestamps = v.timestamps
+            self.assertIsNone(pyvidplayer2.probe_cache.load("resources/vfr.mp4", "pts"))
+            self.assertTrue(any(file.endswith(".index.npz") for file in os.listdir(cache_dir)))
+
+            # loaded with the index when opened again, so nothing is extracted
+            pyvidplayer2.clear_probe_cache()
+            with Video("resources/vfr.mp4", vfr=True, no_audio=True) as v:
+                self.assertIsNone(v._pts_thread)
+                self.assertTrue(np.array_equal(v.timestamps, timestamps))
+                self.assertIsNotNone(v._vid.frame_index)
+
+            pyvidplayer2.set_cache_dir(None)
+
+    # tests that a saved frame index gives exact seeks and is reused on later opens
+    def test_saved_frame_index(self):
+        self.addCleanup(pyvidplayer2.clear_probe_cache)
+        self.addCleanup(lambda: pyvidplayer2.set_cache_dir(None))
+
+        # ffmpeg reader pads variable frame rates with duplicate frames, opencv doesn't
+        with Video("resources/vfr.mp4", reader=READER_OPENCV, no_audio=True) as v:
+            frames = []
+            has_frame, data = v._vid.read()
+            while has_frame:
+                frames.append(data)
+                has_frame, data = v._vid.read()
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            pyvidplayer2.set_cache_dir(cache_dir)
+
+            v = Video("resources/vfr.mp4", reader=READER_FFMPEG, no_audio=True)
+            self.assertIsNone(v._vid.frame_index)
+            v.build_index(background=True)
+            v._index_thread.join()
+
+            index = v._vid.frame_index
+            self.assertEqual(len(index), len(frames))
+            self.assertEqual(index.keyframes[0], 0)
+            self.assertEqual(index.get_keyframe(len(frames) - 1), index.keyframes[-1])
+            self.assertTrue(np.all(np.diff(index.pts) > 0))
+            self.assertTrue(any(file.endswith(".index.npz") for file in os.listdir(cache_dir)))
+
+            # nominal frame rate is wrong for most of this video
+            for i in random.sample(range(len(frames)), 10):
+                v.seek_frame(i, intuitive=False)
+                self.assertEqual(v.get_pos(), index.pts[i])
+                # colour conversion differs slightly between readers
+                self.assertLess(np.abs(next(v).astype(int) - frames[i]).mean(), 2)
+            v.close()
+
+            # loaded again when reopened, and used for vfr timestamps as well
+            v = Video("resources/vfr.mp4", reader=READER_OPENCV, no_audio=True, vfr=True)
+            self.assertIsNone(v._pts_thread)
+            self.assertTrue(np.array_equal(v._vid.frame_index.pts, index.pts))
+            self.assertIs(v.timestamps, v._vid.frame_index.pts)
+            for i in random.sample(range(len(frames)), 10):
+                v.seek_frame(i, intuitive=False)
+                self.assertTrue(check_same_frames(next(v), frames[i]))
+            v.close()
+
+            pyvidplayer2.set_cache_dir(None)
+
+        with Video("resources/vfr.mp4", no_audio=True) as v:
+            self.assertIsNone(v._vid.frame_index)
+
+    # tests that opencv seeks land on the right frame when it converts keyframe times with the wrong frame rate
+    def test_opencv_keyframe_seeking(self):
+        with Video("resources/vfr.mp4", reader=READER_OPENCV, no_audio=True) as v:
+            frames = []
+            has_frame, data = v._vid.read()
+            while has_frame:
+                frames.append(data)
+                has_frame, data = v._vid.read()
+
+            # pretends every fifth frame is a keyframe, so opencv has to convert a time for most seeks
+            index = pyvidplayer2.frame_index.build("resources/vfr.mp4")
+            v._vid.frame_index = pyvidplayer2.frame_index.FrameIndex(index.pts, range(0, len(frames), 5))
+            for i in random.sample(range(len(frames)), 20) + [0, len(frames) - 1]:
+                v._vid.seek(i)
+                self.assertEqual(v._vid.frame, i)
+                has_frame, data = v._vid.read()
+                self.assertTrue(has_frame)
+                self.assertTrue(np.array_equal(data, frames[i]))
+
+        # tests that reversed videos only keep a couple of segments in memory
+    def test_reverse_segments(self):
+        frames = read_all_frames(VIDEO_PATH, no_audio=True)
+
+        for indexed in (False, True):
+            v = Video(VIDEO_PATH, reverse=True, no_audio=True)
+            self.assertFalse(v._preloaded)
+            if indexed:
+                v.build_index()
+            segment = int(v.frame_rate)
+            for i, frame in enumerate(v):
+                self.assertTrue(check_same_frames(frame, frames[v.frame_count - i - 1]))
+                self.assertLessEqual(v._reverse_buffer.get_stats()["frames"], segment * 2)
+            self.assertEqual(v.frame, v.frame_count)
+
+            stats = v._reverse_buffer.get_stats()
+            self.assertLessEqual(stats["peak_frames"], segment * 2)
+            self.assertGreater(stats["prefetched"], 0)
+
+            # segments start on keyframes when they're known
+            for keyframe in (v._frame_index.keyframes if indexed else [v.frame_count - 1]):
+                expected = keyframe if indexed else keyframe - segment + 1
+                self.assertEqual(v._get_reverse_segment_start(int(keyframe)), max(expected, 0))
+            v.close()
+            self.assertEqual(v._reverse_buffer.get_stats()["frames"], 0)
+
+    # tests that reversed videos start from the real last frame when the frame count overshoots
+    def test_reverse_frame_count(self):
+        # header counts a packet that's never shown
+        frames = read_all_frames("resources/vfr.mp4", reader=READER_OPENCV, no_audio=True)
+        with Video("resources/vfr.mp4", reader=READER_OPENCV, no_audio=True) as v:
+            self.assertGreater(v.frame_count, len(frames))
+
+        v = Video("resources/vfr.mp4", reverse=True, reader=READER_OPENCV, no_audio=True)
+        self.assertEqual(v.frame_count, len(frames))
+        self.assertEqual(v._reverse_buffer.get_stats()["misses"], 1)
+        for i, frame in enumerate(v):
+            self.assertTrue(check_same_frames(frame, frames[-i - 1]))
+        self.assertEqual(v.frame, len(frames))
+        v.close()
+
+        # changing decode-ahead waits for the worker before moving the reader
+        v = Video(VIDEO_PATH, reverse=True, no_audio=True)
+        v._reverse_buffer._prefetch(100)
+        v.set_decode_ahead(2)
+        self.assertIsNone(v._reverse_buffer._thread)
+        v.close()
+
     # max threads param is deprecated and should be locked to 1
     def test_max_threads_deprecation(self):
         v = Video(VIDEO_PATH, max_threads=5)
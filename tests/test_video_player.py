@@ -1,13 +1,17 @@
 # test resources: https://github.com/anrayliu/pyvidplayer2-test-resources
 
 
+import os
 import random
+import tempfile
 import time
 import unittest
+import unittest.mock
 from threading import Thread
 
 import cv2
 import pygame
+import pyvidplayer2
 from pyvidplayer2 import Video, VideoPlayer, VideoStreamError, VideoTkinter
 
 from test_video import VIDEO_PATH, check_same_frames, timed_loop, while_loop
@@ -256,9 +260,11 @@ class TestVideoPlayer(unittest.TestCase):
         # test that preview thumbnail loading does not change vid frame pointer
         self.assertEqual(original_video._vid._vidcap.get(cv2.CAP_PROP_POS_FRAMES), 0)
         vp = VideoPlayer(original_video, (0, 0, original_video.original_size[0], original_video.original_size[1]), preview_thumbnails=30)
+        vp._thumbnail_loader.join()
         self.assertEqual(original_video._vid._vidcap.get(cv2.CAP_PROP_POS_FRAMES), 0)
 
         self.assertEqual(len(vp._interval_frames), 31)
+        self.assertNotIn(None, vp._interval_frames)
         self.assertEqual(vp.video._vid.frame, 0)
 
         viewed_thumbnails = []
@@ -284,6 +290,214 @@ class TestVideoPlayer(unittest.TestCase):
 
         vp.close()
 
+    # tests that preview thumbnails are loaded in the background without touching the video's reader
+    def test_background_thumbnails(self):
+        v = Video(VIDEO_PATH)
+        vp = VideoPlayer(v, (0, 0, *v.original_size), interactable=True, preview_thumbnails=40)
+        self.assertEqual(len(vp._interval_frames), 41)
+        self.assertEqual(v._vid.frame, 0)
+
+        # the player can be drawn while thumbnails are still loading
+        vp._show_ui = vp._show_seek = True
+        vp.draw(pygame.Surface(v.original_size))
+
+        vp._thumbnail_loader.join()
+        self.assertNotIn(None, vp._interval_frames)
+        self.assertEqual(vp._thumbnail_loader.get_stats(), {"loaded": 41, "failed": 0, "total": 41, "loading": False})
+        self.assertEqual(v._vid.frame, 0)
+
+        # thumbnails are taken from the same frames as the video's reader would give
+        v._vid.seek(vp._thumbnail_loader.indices[20])
+        self.assertTrue(check_same_frames(pygame.surfarray.array3d(vp._interval_frames[20]),
+                                          pygame.surfarray.array3d(vp._create_thumbnail(v._vid.read()[1]))))
+
+        # thumbnails that haven't loaded are stood in for by the closest loaded one
+        surf = vp._interval_frames[10]
+        vp._interval_frames[11] = vp._interval_frames[12] = None
+        self.assertIs(vp._get_closest_frame(11.4 * vp._interval), surf)
+        vp._interval_frames[:] = [None] * 41
+        self.assertIsNone(vp._get_closest_frame(0))
+        vp.draw(pygame.Surface(v.original_size))
+        vp.close()
+
+        # closing stops the workers
+        v = Video(VIDEO_PATH)
+        vp = VideoPlayer(v, (0, 0, *v.original_size), preview_thumbnails=200)
+        vp.close()
+        self.assertFalse(vp._thumbnail_loader.get_stats()["loading"])
+
+    # tests that thumbnails are saved as a sprite sheet and loaded from it by later players
+    def test_thumbnail_cache(self):
+        self.addCleanup(pyvidplayer2.clear_probe_cache)
+        self.addCleanup(lambda: pyvidplayer2.set_cache_dir(None))
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            pyvidplayer2.set_cache_dir(cache_dir)
+
+            v = Video(VIDEO_PATH)
+            vp = VideoPlayer(v, (0, 0, *v.original_size), preview_thumbnails=25)
+            vp._thumbnail_loader.join()
+            thumbnails = [pygame.surfarray.array3d(surf) for surf in vp._interval_frames]
+            vp.close()
+
+            files = os.listdir(cache_dir)
+            self.assertEqual(len([file for file in files if file.endswith(".png")]), 1)
+            self.assertEqual(len([file for file in files if ".thumbs." in file and file.endswith(".json")]), 1)
+
+            # nothing is decoded when the sheet is found
+            v = Video(VIDEO_PATH)
+            vp = VideoPlayer(v, (0, 0, *v.original_size), preview_thumbnails=25)
+            self.assertIsNone(vp._thumbnail_loader)
+            self.assertEqual(len(vp._interval_frames), 26)
+            for f1, f2 in zip(thumbnails, vp._interval_frames):
+                self.assertTrue(check_same_frames(f1, pygame.surfarray.array3d(f2)))
+            vp.close()
+
+            # a different number of thumbnails isn't a hit
+            v = Video(VIDEO_PATH)
+            vp = VideoPlayer(v, (0, 0, *v.original_size), preview_thumbnails=10)
+            self.assertIsNotNone(vp._thumbnail_loader)
+            vp._thumbnail_loader.join()
+            vp.close()
+            self.assertEqual(len([file for file in os.listdir(cache_dir) if file.endswith(".png")]), 2)
+
+            # thumbnails that didn't all load aren't saved
+            v = Video(VIDEO_PATH)
+            vp = VideoPlayer(v, (0, 0, *v.original_size), preview_thumbnails=300)
+            vp.close()
+            self.assertEqual(len([file for file in os.listdir(cache_dir) if file.endswith(".png")]), 2)
+
+            pyvidplayer2.set_cache_dir(None)
+
+    # tests that dragging along the progress bar previews keyframes and only seeks on release
+    def test_scrubbing(self):
+        def scrub(vp, x, *event_types):
+            pos = (vp._progress_back.x + int(vp._progress_back.w * x), vp._progress_back.centery)
+            with unittest.mock.patch("pygame.mouse.get_pos", return_value=pos):
+                vp.update([pygame.event.Event(event_type, button=1, pos=pos) for event_type in event_types])
+
+        # previews are decoded in the background and picked up on the next update
+        def wait_preview(vp, x):
+            vp.video._scrub_previewer.join()
+            scrub(vp, x)
+
+        for build_index in (False, True):
+            v = Video(VIDEO_PATH)
+            if build_index:
+                v.build_index()
+            vp = VideoPlayer(v, (0, 0, *v.original_size), interactable=True)
+            vp.update()
+
+            with unittest.mock.patch.object(v._vid, "seek", wraps=v._vid.seek) as seek:
+                scrub(vp, 0.5, pygame.MOUSEBUTTONDOWN)
+                self.assertTrue(vp._scrubbing)
+                self.assertTrue(v.paused)
+                wait_preview(vp, 0.5)
+                first = v.frame_data
+                self.assertEqual(first.shape, (v.current_size[1], v.current_size[0], 3))
+
+                # scrubbing never indexes the video itself
+                self.assertEqual(v._frame_index is not None, build_index)
+                self.assertEqual(v._scrub_reader is not None, build_index)
+
+                scrub(vp, 0.8)
+                self.assertTrue(vp._scrubbing)
+                wait_preview(vp, 0.8)
+                self.assertFalse(check_same_frames(first, v.frame_data))
+
+                # leaving the player while dragging keeps scrubbing
+                scrub(vp, 1.5)
+                self.assertTrue(vp._scrubbing)
+                self.assertEqual(vp._seek_time, v.duration)
+                wait_preview(vp, 1.5)
+
+                # the video's reader isn't touched until the mouse is released
+                seek.assert_not_called()
+
+            if build_index:
+                # the preview is exactly the keyframe before the time
+                keyframe = v._scrub_keyframe
+                self.assertIn(keyframe, v._frame_index.keyframes)
+                preview = v.frame_data
+                v._vid.seek(keyframe)
+                self.assertTrue(check_same_frames(preview, v._process_frame(v._vid.read()[1])))
+
+            # only the latest position is decoded once the worker is free
+            v._scrub_keyframe = None
+            with unittest.mock.patch.object(v, "_read_keyframe", wraps=v._read_keyframe) as read_keyframe:
+                with v._scrub_previewer._cond:
+                    for x in (0.1, 0.2, 0.3):
+                        scrub(vp, x)
+                wait_preview(vp, 0.3)
+                read_keyframe.assert_called_once()
+                self.assertAlmostEqual(read_keyframe.call_args[0][0], v.duration * 0.3, delta=0.1)
+
+            scrub(vp, 0.25, pygame.MOUSEBUTTONUP)
+            self.assertFalse(vp._scrubbing)
+            self.assertFalse(v.paused)
+            self.assertAlmostEqual(v.get_pos(), v.duration * 0.25, delta=0.1)
+
+            # a click is a drag that ends right away
+            scrub(vp, 0.6, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+            self.assertFalse(vp._scrubbing)
+            self.assertAlmostEqual(v.get_pos(), v.duration * 0.6, delta=0.1)
+            vp.close()
+
+    # tests that the next path in the queue is opened and buffered before the current video ends
+    def test_prefetch_queue(self):
+        v = Video(VIDEO_PATH)
+        vp = VideoPlayer(v, (0, 0, *v.original_size))
+        vp.queue("resources/clip.mp4")
+
+        # too far from the end
+        vp.update()
+        self.assertIsNone(vp._prefetch_thread)
+
+        v.seek(v.duration - 3, relative=False)
+        vp.update()
+        self.assertIsNotNone(vp._prefetch_thread)
+        vp._prefetch_thread.join()
+        path, video = vp._prefetched
+        self.assertEqual(path, "resources/clip.mp4")
+
+        # first audio chunk is loaded and first frame is shown, but playback hasn't started
+        self.assertIsNotNone(video._chunks[0])
+        self.assertEqual(video._chunks_played, 0)
+        self.assertEqual(video._vid.frame, 0)
+        with Video("resources/clip.mp4") as reference:
+            self.assertTrue(check_same_frames(video.frame_data, next(reference)))
+
+        vp.skip()
+        self.assertIs(vp.video, video)
+        self.assertIsNone(vp._prefetched)
+        self.assertTrue(video.active)
+        while_loop(lambda: video.frame < 10, vp.update, 10)
+        vp.close()
+
+        # prefetched videos are closed if they're not played
+        v = Video(VIDEO_PATH)
+        vp = VideoPlayer(v, (0, 0, *v.original_size))
+        vp.queue("resources/clip.mp4")
+        v.seek(v.duration - 1, relative=False)
+        vp.update()
+        vp._prefetch_thread.join()
+        video = vp._prefetched[1]
+        vp.clear_queue()
+        self.assertTrue(video.closed)
+        self.assertIsNone(vp._prefetch_thread)
+        vp.close()
+
+        # errors opening the path are raised when the video is needed, like without prefetching
+        v = Video(VIDEO_PATH)
+        vp = VideoPlayer(v, (0, 0, *v.original_size))
+        vp.queue("resources/missing.mp4")
+        v.seek(v.duration - 1, relative=False)
+        vp.update()
+        vp._prefetch_thread.join()
+        with self.assertRaises(FileNotFoundError):
+            vp.skip()
+        vp.close()
+
     # tests requested preview thumbnails is bounded
     def test_preview_thumbnails_bounds(self):
         v = Video("resources/myGif.gif")
@@ -15,7 +15,7 @@ from pyvidplayer2 import (READER_AUTO, READER_FFMPEG, READER_IMAGEIO,
                           YTDLPError)
 
 from test_subtitles import SUBS
-from test_video import check_same_frames, timed_loop, while_loop
+from test_video import check_same_frames, read_all_frames, timed_loop, while_loop
 
 
 def get_youtube_urls(max_results=5):
@@ -130,9 +130,10 @@ class TestYoutubeVideo(unittest.TestCase):
 
     # tests that youtube videos can be played in reverse
     def test_reverse(self):
+        frames = read_all_frames(YOUTUBE_PATH, youtube=True)
         v = Video(YOUTUBE_PATH, reverse=True, youtube=True)
         for i, frame in enumerate(v):
-            self.assertTrue(check_same_frames(frame, v._preloaded_frames[v.frame_count - i - 1]))
+            self.assertTrue(check_same_frames(frame, frames[v.frame_count - i - 1]))
         v.close()
 
     # tests for errors for unsupported youtube links